@@ -0,0 +1,30 @@
+# _country_reqs_gen.py
+#
+# GENERATED by scripts/gen_country_reqs.py from country_requirements.json.
+# Do not edit by hand; edit the JSON source and regenerate.
+
+from typing import Dict, Tuple
+
+DEFAULT_REQUIREMENTS: Tuple[str, ...] = (
+    'Standard customs declaration',
+    'Country-specific import/export permits if required',
+    'Local language translation of key documents may be required',
+)
+
+REQUIREMENTS: Dict[str, Tuple[str, ...]] = {
+    'us': (
+        'AES (Automated Export System) filing required for exports over $2,500',
+        'OFAC sanctions screening required',
+        'Anti-dumping duty documentation if applicable',
+    ),
+    'cn': (
+        'China Compulsory Certification (CCC) for applicable products',
+        'SAFE (State Administration of Foreign Exchange) registration',
+        'Customs declaration in Chinese language',
+    ),
+    'eu': (
+        'CE marking for applicable products',
+        'EORI (Economic Operators Registration and Identification) number',
+        'EUR.1 or EUR-MED certificate for preferential treatment',
+    ),
+}
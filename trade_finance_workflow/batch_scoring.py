@@ -0,0 +1,273 @@
+# batch_scoring.py
+
+import threading
+from typing import Any, Dict, List, Tuple
+import numpy as np
+from numba import get_num_threads, njit, prange
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Compliance components: KYC/AML, sanctions screening, trade compliance, documentation.
+# Each is drawn uniformly over [COMPLIANCE_LOW, COMPLIANCE_LOW + COMPLIANCE_SPAN), except
+# sanctions screening, which is 1.0 (clear) with probability SANCTIONS_PASS_RATE, else 0.0
+COMPLIANCE_LOW = np.array([0.7, 0.0, 0.8, 0.7])
+COMPLIANCE_SPAN = np.array([0.3, 1.0, 0.2, 0.3])
+COMPLIANCE_WEIGHTS = np.array([30, 25, 25, 20], dtype=np.float64)
+SANCTIONS_PASS_RATE = 0.75
+
+# A component below its threshold raises the matching issue
+COMPLIANCE_ISSUE_THRESHOLDS = np.array([0.8, 1.0, 0.0, 0.9])
+COMPLIANCE_ISSUES = (
+    "KYC documentation incomplete",
+    "Potential sanctions match found",
+    None,
+    "Some documentation missing or incomplete"
+)
+
+# Risk components, each drawn uniformly over [RISK_LOW, RISK_LOW + RISK_SPAN)
+RISK_NAMES = ('Market risk', 'Credit risk', 'Operational risk', 'Country risk', 'Currency risk')
+RISK_LOW = np.array([0.1, 0.1, 0.1, 0.1, 0.1])
+RISK_SPAN = np.array([0.7, 0.6, 0.5, 0.8, 0.4])
+RISK_WEIGHTS = np.array([25, 30, 20, 15, 10], dtype=np.float64)
+
+# Rule-based credit assessment, quantised: each factor is reduced to a small integer
+# code that indexes an int8 points table and the matching factor description
+REVENUE_THRESHOLDS = (500000, 1000000, 5000000, 10000000)  # bucket = bisect_right
+_REVENUE_POINTS = np.array([5, 10, 15, 20, 25], dtype=np.int8)
+REVENUE_FACTORS = (
+    "Low revenue base (<$500K)",
+    "Limited revenue base ($500K+)",
+    "Moderate revenue base ($1M+)",
+    "Good revenue base ($5M+)",
+    "Strong revenue base ($10M+)"
+)
+
+YEARS_THRESHOLDS = (2, 5, 10)  # bucket = bisect_right
+_YEARS_POINTS = np.array([5, 10, 15, 20], dtype=np.int8)
+YEARS_FACTORS = (
+    "New business (<2 years)",
+    "Growing business (2+ years)",
+    "Mature business (5+ years)",
+    "Established business (10+ years)"
+)
+
+# Credit history codes: 0 unknown, 1 excellent, 2 good, 3 fair, 4 poor
+_CREDIT_HISTORY_POINTS = np.array([10, 20, 15, 10, 5], dtype=np.int8)
+CREDIT_HISTORY_FACTORS = (
+    "Unknown credit history",
+    "Excellent credit history",
+    "Good credit history",
+    "Fair credit history",
+    "Poor credit history"
+)
+
+# Finance amount / revenue, scaled by FINANCE_RATIO_SCALE and rounded up so that
+# ratio <= 0.1 exactly when finance_ratio_q <= 100; FINANCE_RATIO_UNKNOWN when revenue is 0
+FINANCE_RATIO_SCALE = 1000
+FINANCE_RATIO_UNKNOWN = -1
+FINANCE_RATIO_THRESHOLDS = np.array([100, 250, 500], dtype=np.int16)  # bucket = searchsorted left
+_FINANCE_RATIO_POINTS = np.array([15, 12, 8, 3], dtype=np.int8)
+_FINANCE_RATIO_UNKNOWN_POINTS = 5
+FINANCE_RATIO_FACTORS = (
+    "Conservative financing ratio (≤10%)",
+    "Moderate financing ratio (≤25%)",
+    "High financing ratio (≤50%)",
+    "Very high financing ratio (>50%)"
+)
+FINANCE_RATIO_UNKNOWN_FACTOR = "Unable to assess financing ratio"
+
+# Industry codes: 0 unknown, 1 low, 2 medium, 3 high risk
+_INDUSTRY_POINTS = np.array([6, 10, 7, 4], dtype=np.int8)
+INDUSTRY_FACTORS = ("Unknown industry risk", "Low-risk industry", "Medium-risk industry", "High-risk industry")
+
+# Country codes: 0 high, 1 low, 2 medium risk
+_COUNTRY_POINTS = np.array([4, 10, 7], dtype=np.int8)
+COUNTRY_FACTORS = ("High country risk", "Low country risk", "Medium country risk")
+
+_RNG = np.random.default_rng()
+
+# The processing pool calls the parallel kernels from its worker threads. Start Numba's
+# thread pool here, on the importing (main) thread: a pool first started from a worker
+# thread hangs the interpreter at exit. The default workqueue threading layer is also
+# not thread-safe, so kernels are launched one at a time.
+get_num_threads()
+_KERNEL_LOCK = threading.Lock()
+
+def draw_compliance_values(count: int) -> np.ndarray:
+    """Draw compliance components for `count` applications, shape (count, 4)"""
+    values = COMPLIANCE_LOW + _RNG.random((count, len(COMPLIANCE_WEIGHTS))) * COMPLIANCE_SPAN
+    values[:, 1] = values[:, 1] < SANCTIONS_PASS_RATE
+    return values
+
+def compliance_findings(values: np.ndarray) -> Tuple[List[str], List[str]]:
+    """Check descriptions and issues for one application's compliance components"""
+    kyc_score, sanctions_clear, trade_compliance, doc_completeness = values
+    checks = [
+        f"KYC/AML: {kyc_score:.2f}",
+        "Sanctions screening: CLEAR" if sanctions_clear else "Sanctions screening: FLAGGED",
+        f"Trade compliance: {trade_compliance:.2f}",
+        f"Documentation: {doc_completeness:.2f}"
+    ]
+    issues = [COMPLIANCE_ISSUES[i] for i in np.flatnonzero(values < COMPLIANCE_ISSUE_THRESHOLDS)]
+    return checks, issues
+
+def quantize_finance_ratio(finance_amount: float, revenue: float) -> int:
+    """Finance amount / revenue as an int16 fixed-point value, FINANCE_RATIO_UNKNOWN if revenue is 0"""
+    if revenue <= 0:
+        return FINANCE_RATIO_UNKNOWN
+    return min(int(np.ceil(finance_amount / revenue * FINANCE_RATIO_SCALE)), np.iinfo(np.int16).max)
+
+def credit_factor_descriptions(industry_code: int, country_code: int, years_bucket: int, revenue_bucket: int,
+                               credit_history_code: int, finance_ratio_q: int) -> List[str]:
+    """Factor descriptions for one encoded application, matching the points credit_score_batch adds"""
+    if finance_ratio_q == FINANCE_RATIO_UNKNOWN:
+        ratio_factor = FINANCE_RATIO_UNKNOWN_FACTOR
+    else:
+        ratio_factor = FINANCE_RATIO_FACTORS[int(np.searchsorted(FINANCE_RATIO_THRESHOLDS, finance_ratio_q))]
+    return [
+        REVENUE_FACTORS[revenue_bucket],
+        YEARS_FACTORS[years_bucket],
+        CREDIT_HISTORY_FACTORS[credit_history_code],
+        ratio_factor,
+        INDUSTRY_FACTORS[industry_code],
+        COUNTRY_FACTORS[country_code]
+    ]
+
+def credit_factors(industry_code: int, country_code: int, years_bucket: int, revenue_bucket: int,
+                   credit_history_code: int, finance_ratio_q: int) -> Tuple[int, List[str]]:
+    """Rule-based credit score and factor descriptions for one encoded application, without the kernel"""
+    score = (int(_REVENUE_POINTS[revenue_bucket]) + int(_YEARS_POINTS[years_bucket])
+             + int(_CREDIT_HISTORY_POINTS[credit_history_code])
+             + int(_INDUSTRY_POINTS[industry_code]) + int(_COUNTRY_POINTS[country_code]))
+    if finance_ratio_q == FINANCE_RATIO_UNKNOWN:
+        score += _FINANCE_RATIO_UNKNOWN_POINTS
+    else:
+        score += int(_FINANCE_RATIO_POINTS[int(np.searchsorted(FINANCE_RATIO_THRESHOLDS, finance_ratio_q))])
+    
+    factors = credit_factor_descriptions(industry_code, country_code, years_bucket, revenue_bucket,
+                                         credit_history_code, finance_ratio_q)
+    return score, factors
+
+def compliance_status(compliance_score: float, has_issues: bool) -> str:
+    """Map a compliance score to compliant / conditional / non_compliant"""
+    if compliance_score >= 85 and not has_issues:
+        return 'compliant'
+    elif compliance_score >= 70:
+        return 'conditional'
+    else:
+        return 'non_compliant'
+
+def risk_level(risk_score: float) -> str:
+    """Map a 0-100 risk score to a risk level"""
+    if risk_score <= 25:
+        return 'very_low'
+    elif risk_score <= 40:
+        return 'low'
+    elif risk_score <= 60:
+        return 'medium'
+    elif risk_score <= 80:
+        return 'high'
+    else:
+        return 'very_high'
+
+@njit(parallel=True, cache=True)
+def _score_batch(compliance_values, risk_values, compliance_weights, risk_weights,
+                 out_compliance, out_risk):
+    """Weighted compliance and risk scores for every application in the batch"""
+    for i in prange(compliance_values.shape[0]):
+        compliance_score = 0.0
+        for j in range(compliance_values.shape[1]):
+            compliance_score += compliance_values[i, j] * compliance_weights[j]
+        out_compliance[i] = compliance_score
+        
+        risk_score = 0.0
+        for j in range(risk_values.shape[1]):
+            risk_score += risk_values[i, j] * risk_weights[j]
+        out_risk[i] = risk_score
+
+@njit(parallel=True, cache=True)
+def _credit_score_batch(industry_code, country_code, years_bucket, revenue_bucket,
+                        credit_history_code, finance_ratio_q,
+                        industry_points, country_points, years_points, revenue_points,
+                        credit_history_points, finance_ratio_thresholds, finance_ratio_points,
+                        finance_ratio_unknown_points, out_credit):
+    """Rule-based credit scores from the encoded application columns via the points tables"""
+    for i in prange(industry_code.shape[0]):
+        score = (np.int16(industry_points[industry_code[i]])
+                 + np.int16(country_points[country_code[i]])
+                 + np.int16(years_points[years_bucket[i]])
+                 + np.int16(revenue_points[revenue_bucket[i]])
+                 + np.int16(credit_history_points[credit_history_code[i]]))
+        
+        ratio = finance_ratio_q[i]
+        if ratio < 0:
+            score += finance_ratio_unknown_points
+        else:
+            bucket = 0
+            while bucket < finance_ratio_thresholds.shape[0] and ratio > finance_ratio_thresholds[bucket]:
+                bucket += 1
+            score += finance_ratio_points[bucket]
+        out_credit[i] = score
+
+def credit_score_batch(industry_code: np.ndarray, country_code: np.ndarray, years_bucket: np.ndarray,
+                       revenue_bucket: np.ndarray, credit_history_code: np.ndarray,
+                       finance_ratio_q: np.ndarray) -> np.ndarray:
+    """Rule-based credit scores (int16) for a batch of encoded applications.
+    
+    The code columns are int8 and finance_ratio_q is int16, one entry per application,
+    encoded the same way as the arguments to credit_factors.
+    """
+    out_credit = np.empty(industry_code.shape[0], dtype=np.int16)
+    with _KERNEL_LOCK:
+        _credit_score_batch(industry_code, country_code, years_bucket, revenue_bucket,
+                            credit_history_code, finance_ratio_q,
+                            _INDUSTRY_POINTS, _COUNTRY_POINTS, _YEARS_POINTS, _REVENUE_POINTS,
+                            _CREDIT_HISTORY_POINTS, FINANCE_RATIO_THRESHOLDS, _FINANCE_RATIO_POINTS,
+                            np.int16(_FINANCE_RATIO_UNKNOWN_POINTS), out_credit)
+    return out_credit
+
+def check_compliance_and_analyze_risk_batch(count: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Run the compliance check and risk analysis for `count` queued applications at once.
+    
+    Returns one compliance result and one risk result per application, in the same
+    shape as TradeFinanceRunnable.check_compliance / analyze_risk.
+    """
+    compliance_values = draw_compliance_values(count)
+    
+    risk_values = RISK_LOW + _RNG.random((count, len(RISK_NAMES))) * RISK_SPAN
+    
+    compliance_scores = np.empty(count)
+    risk_scores = np.empty(count)
+    with _KERNEL_LOCK:
+        _score_batch(compliance_values, risk_values, COMPLIANCE_WEIGHTS, RISK_WEIGHTS,
+                     compliance_scores, risk_scores)
+    
+    compliance_results = []
+    risk_results = []
+    for i in range(count):
+        compliance_score = float(compliance_scores[i])
+        checks, issues = compliance_findings(compliance_values[i])
+        
+        compliance_results.append({
+            'success': True,
+            'compliance_score': round(compliance_score, 2),
+            'status': compliance_status(compliance_score, bool(issues)),
+            'checks': checks,
+            'issues': issues,
+            'method': 'automated'
+        })
+        
+        risk_score = float(risk_scores[i])
+        risk_results.append({
+            'success': True,
+            'risk_score': round(risk_score, 2),
+            'risk_level': risk_level(risk_score),
+            'risk_factors': [f"{name}: {value:.2f}" for name, value in zip(RISK_NAMES, risk_values[i])],
+            'method': 'comprehensive'
+        })
+    
+    logger.info(f"Batch compliance and risk scoring completed for {count} applications")
+    return compliance_results, risk_results
@@ -2,9 +2,10 @@
 
 import sqlite3
 import json
+from functools import cached_property
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from sqlalchemy import create_engine, event, inspect, text, Column, Index, Integer, String, Float, DateTime, Text, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.sql import func
@@ -19,6 +20,11 @@ Base = declarative_base()
 class TradeFinanceApplication(Base):
     """Trade Finance Application model"""
     __tablename__ = 'trade_finance_applications'
+    __table_args__ = (
+        # Serves get_applications' status filter and application_id ordering, and the
+        # statistics GROUP BY status, as index range scans
+        Index('idx_apps_status_application_id', 'status', 'application_id'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     application_id = Column(String(50), unique=True, nullable=False)
@@ -48,6 +54,7 @@ class TradeFinanceApplication(Base):
     status = Column(String(50), default='submitted')
     priority = Column(String(20), default='normal')
     assigned_officer = Column(String(100))
+    processing_results = Column(Text)  # JSON string
     
     # AI Screening Results
     ai_screening_result = Column(Text)  # JSON string
@@ -91,6 +98,24 @@ class TradeFinanceApplication(Base):
     approval_conditions = Column(Text)
     rejection_reason = Column(Text)
     
+    # Display strings, formatted on first use
+    @cached_property
+    def amount_display(self) -> str:
+        return f"${self.finance_amount:,.2f}" if self.finance_amount else "$0.00"
+    
+    @cached_property
+    def submitted_display(self) -> str:
+        return self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else ""
+    
+    @cached_property
+    def processed_display(self) -> str:
+        return self.processed_at.strftime('%Y-%m-%d %H:%M:%S') if self.processed_at else ""
+    
+    @cached_property
+    def processing_results_obj(self) -> Optional[Dict[str, Any]]:
+        """processing_results parsed from JSON, once per record"""
+        return json.loads(self.processing_results) if self.processing_results else None
+    
 class ProcessingStep(Base):
     """Processing step tracking model"""
     __tablename__ = 'processing_steps'
@@ -148,39 +173,84 @@ class Database:
         self.db_path = db_path
         self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
         Base.metadata.create_all(self.engine)
+        
+        # create_all never alters existing tables, so add columns newer than the database
+        application_columns = {
+            column['name'] for column in inspect(self.engine).get_columns('trade_finance_applications')
+        }
+        if 'processing_results' not in application_columns:
+            with self.engine.begin() as connection:
+                connection.execute(text("ALTER TABLE trade_finance_applications ADD COLUMN processing_results TEXT"))
+            logger.info("Added processing_results column to trade_finance_applications")
+        
+        # create_all only adds indexes along with new tables
+        for index in TradeFinanceApplication.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        
+        # Notify listeners after each commit that changes applications
+        self._change_listeners: List[Callable[[], None]] = []
+        event.listen(self.SessionLocal, 'after_flush', self._track_application_changes)
+        event.listen(self.SessionLocal, 'after_commit', self._notify_application_changes)
+        event.listen(self.SessionLocal, 'after_rollback', self._discard_application_changes)
+        
         logger.info(f"Database initialized: {db_path}")
     
+    def add_change_listener(self, callback: Callable[[], None]):
+        """Call callback after every commit that adds, updates or deletes applications.
+        
+        The callback runs on the committing thread.
+        """
+        self._change_listeners.append(callback)
+    
+    def _track_application_changes(self, session: Session, flush_context: Any):
+        for instances in (session.new, session.dirty, session.deleted):
+            if any(isinstance(instance, TradeFinanceApplication) for instance in instances):
+                session.info['applications_changed'] = True
+                return
+    
+    def _notify_application_changes(self, session: Session):
+        if session.info.pop('applications_changed', False):
+            for callback in self._change_listeners:
+                callback()
+    
+    def _discard_application_changes(self, session: Session):
+        session.info.pop('applications_changed', None)
+    
     def get_session(self) -> Session:
         """Get database session"""
         return self.SessionLocal()
     
+    def _new_application(self, application_data: Dict[str, Any]) -> TradeFinanceApplication:
+        """Build a submitted application record from form data"""
+        return TradeFinanceApplication(
+            application_id=application_data.get('application_id'),
+            company_name=application_data.get('company_name'),
+            company_address=application_data.get('company_address'),
+            company_registration=application_data.get('company_registration'),
+            contact_person=application_data.get('contact_person'),
+            contact_email=application_data.get('contact_email'),
+            contact_phone=application_data.get('contact_phone'),
+            trade_type=application_data.get('trade_type'),
+            finance_amount=application_data.get('finance_amount'),
+            currency=application_data.get('currency', 'USD'),
+            payment_terms=application_data.get('payment_terms'),
+            trade_description=application_data.get('trade_description'),
+            counterparty_name=application_data.get('counterparty_name'),
+            counterparty_country=application_data.get('counterparty_country'),
+            counterparty_address=application_data.get('counterparty_address'),
+            counterparty_bank=application_data.get('counterparty_bank'),
+            status='submitted',
+            priority=application_data.get('priority', 'normal'),
+            notes=application_data.get('notes')
+        )
+    
     def add_application(self, application_data: Dict[str, Any]) -> bool:
         """Add new trade finance application"""
         try:
             session = self.get_session()
             
-            application = TradeFinanceApplication(
-                application_id=application_data.get('application_id'),
-                company_name=application_data.get('company_name'),
-                company_address=application_data.get('company_address'),
-                company_registration=application_data.get('company_registration'),
-                contact_person=application_data.get('contact_person'),
-                contact_email=application_data.get('contact_email'),
-                contact_phone=application_data.get('contact_phone'),
-                trade_type=application_data.get('trade_type'),
-                finance_amount=application_data.get('finance_amount'),
-                currency=application_data.get('currency', 'USD'),
-                payment_terms=application_data.get('payment_terms'),
-                trade_description=application_data.get('trade_description'),
-                counterparty_name=application_data.get('counterparty_name'),
-                counterparty_country=application_data.get('counterparty_country'),
-                counterparty_address=application_data.get('counterparty_address'),
-                counterparty_bank=application_data.get('counterparty_bank'),
-                status='submitted',
-                priority=application_data.get('priority', 'normal'),
-                notes=application_data.get('notes')
-            )
+            application = self._new_application(application_data)
             
             session.add(application)
             session.commit()
@@ -204,6 +274,55 @@ class Database:
                 session.close()
             return False
     
+    def add_applications(self, applications_data: List[Dict[str, Any]]) -> List[bool]:
+        """Add several new trade finance applications in a single transaction.
+        
+        Returns one flag per application; applications whose ID already exists are skipped.
+        """
+        try:
+            session = self.get_session()
+            
+            application_ids = [data.get('application_id') for data in applications_data]
+            seen = {
+                application_id for application_id, in session.query(TradeFinanceApplication.application_id).filter(
+                    TradeFinanceApplication.application_id.in_(application_ids)
+                )
+            }
+            
+            added = []
+            for application_data in applications_data:
+                application_id = application_data.get('application_id')
+                if application_id in seen:
+                    logger.warning(f"Application already exists: {application_id}")
+                    added.append(False)
+                    continue
+                seen.add(application_id)
+                
+                session.add(self._new_application(application_data))
+                
+                # Audit log in the same transaction
+                session.add(AuditLog(
+                    application_id=application_id,
+                    action='application_submitted',
+                    action_details=f"New trade finance application submitted for {application_data.get('company_name')}",
+                    performed_by='system',
+                    result='success'
+                ))
+                added.append(True)
+            
+            session.commit()
+            session.close()
+            
+            logger.info(f"Applications added in batch: {sum(added)}")
+            return added
+            
+        except Exception as e:
+            logger.error(f"Error adding applications in batch: {str(e)}")
+            if 'session' in locals():
+                session.rollback()
+                session.close()
+            return [False] * len(applications_data)
+    
     def update_application(self, application_id: str, updates: Dict[str, Any]) -> bool:
         """Update trade finance application"""
         try:
@@ -245,6 +364,54 @@ class Database:
                 session.close()
             return False
     
+    def update_applications_batch(self, updates: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        """Update several trade finance applications in a single transaction"""
+        try:
+            session = self.get_session()
+            
+            application_ids = [application_id for application_id, _ in updates]
+            applications = {
+                application.application_id: application
+                for application in session.query(TradeFinanceApplication).filter(
+                    TradeFinanceApplication.application_id.in_(application_ids)
+                ).all()
+            }
+            
+            now = datetime.now()
+            for application_id, fields in updates:
+                application = applications.get(application_id)
+                if not application:
+                    logger.warning(f"Application not found: {application_id}")
+                    continue
+                
+                # Update fields
+                for key, value in fields.items():
+                    if hasattr(application, key):
+                        setattr(application, key, value)
+                application.updated_at = now
+                
+                # Audit log in the same transaction
+                session.add(AuditLog(
+                    application_id=application_id,
+                    action='application_updated',
+                    action_details=f"Application updated: {', '.join(fields.keys())}",
+                    performed_by='system',
+                    result='success'
+                ))
+            
+            session.commit()
+            session.close()
+            
+            logger.info(f"Applications updated in batch: {len(updates)}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error updating applications in batch: {str(e)}")
+            if 'session' in locals():
+                session.rollback()
+                session.close()
+            return False
+    
     def get_application(self, application_id: str) -> Optional[Dict[str, Any]]:
         """Get trade finance application by ID"""
         try:
@@ -280,6 +447,7 @@ class Database:
                 'status': application.status,
                 'priority': application.priority,
                 'assigned_officer': application.assigned_officer,
+                'processing_results': self._parse_json_field(application.processing_results),
                 'ai_screening_result': self._parse_json_field(application.ai_screening_result),
                 'ai_screening_score': application.ai_screening_score,
                 'ai_screening_timestamp': application.ai_screening_timestamp,
@@ -317,6 +485,33 @@ class Database:
                 session.close()
             return None
     
+    def get_applications(self, status: Optional[str] = None, limit: int = 100,
+                         after_id: Optional[str] = None) -> List[TradeFinanceApplication]:
+        """Get one page of applications, newest application ID first.
+        
+        Pass the last application_id of the previous page as after_id to get the next
+        page (keyset pagination). The returned records are detached from the session.
+        """
+        try:
+            session = self.get_session()
+            
+            query = session.query(TradeFinanceApplication)
+            if status:
+                query = query.filter(TradeFinanceApplication.status == status)
+            if after_id:
+                query = query.filter(TradeFinanceApplication.application_id < after_id)
+            
+            applications = query.order_by(TradeFinanceApplication.application_id.desc()).limit(limit).all()
+            
+            session.close()
+            return applications
+            
+        except Exception as e:
+            logger.error(f"Error getting applications: {str(e)}")
+            if 'session' in locals():
+                session.close()
+            return []
+    
     def get_applications_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get applications by status"""
         try:
@@ -611,6 +806,43 @@ class Database:
                 }
             }
     
+    def get_trade_finance_statistics(self) -> Dict[str, Any]:
+        """Get the dashboard counters from a single GROUP BY status query"""
+        try:
+            session = self.get_session()
+            
+            status_counts = dict(session.query(
+                TradeFinanceApplication.status,
+                func.count(TradeFinanceApplication.id)
+            ).group_by(TradeFinanceApplication.status).all())
+            
+            session.close()
+            
+            total_applications = sum(status_counts.values())
+            approved_applications = status_counts.get('approved', 0)
+            
+            return {
+                'total_applications': total_applications,
+                'submitted_applications': status_counts.get('submitted', 0),
+                'processing_applications': status_counts.get('processing', 0),
+                'approved_applications': approved_applications,
+                'rejected_applications': status_counts.get('rejected', 0),
+                'approval_rate': round(approved_applications / total_applications * 100, 1) if total_applications else 0
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting trade finance statistics: {str(e)}")
+            if 'session' in locals():
+                session.close()
+            return {
+                'total_applications': 0,
+                'submitted_applications': 0,
+                'processing_applications': 0,
+                'approved_applications': 0,
+                'rejected_applications': 0,
+                'approval_rate': 0
+            }
+    
     def get_processing_steps(self, application_id: str) -> List[Dict[str, Any]]:
         """Get processing steps for an application"""
         try:
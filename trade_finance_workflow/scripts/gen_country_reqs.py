@@ -0,0 +1,56 @@
+# gen_country_reqs.py
+
+"""Generate _country_reqs_gen.py from country_requirements.json.
+
+Run from the trade_finance_workflow directory after editing the JSON source:
+
+    python scripts/gen_country_reqs.py
+"""
+
+import json
+import os
+from typing import Dict, List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(BASE_DIR, 'country_requirements.json')
+OUTPUT_PATH = os.path.join(BASE_DIR, '_country_reqs_gen.py')
+
+HEADER = '''# _country_reqs_gen.py
+#
+# GENERATED by scripts/gen_country_reqs.py from country_requirements.json.
+# Do not edit by hand; edit the JSON source and regenerate.
+
+from typing import Dict, Tuple
+
+'''
+
+def _format_tuple(items: List[str], indent: str) -> str:
+    """Format a list of strings as a multi-line tuple literal"""
+    lines = [f"{indent}    {item!r}," for item in items]
+    return "(\n" + "\n".join(lines) + f"\n{indent})"
+
+def generate(source: Dict) -> str:
+    """Render the generated module source"""
+    parts = [HEADER]
+    
+    parts.append(f"DEFAULT_REQUIREMENTS: Tuple[str, ...] = {_format_tuple(source['default'], '')}\n\n")
+    
+    parts.append("REQUIREMENTS: Dict[str, Tuple[str, ...]] = {\n")
+    for key, items in source['countries'].items():
+        parts.append(f"    {key!r}: {_format_tuple(items, '    ')},\n")
+    parts.append("}\n")
+    
+    return "".join(parts)
+
+def main():
+    """Read the JSON source and write the generated module"""
+    with open(SOURCE_PATH, encoding='utf-8') as f:
+        source = json.load(f)
+    
+    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
+        f.write(generate(source))
+    
+    print(f"Wrote {OUTPUT_PATH}")
+
+if __name__ == "__main__":
+    main()
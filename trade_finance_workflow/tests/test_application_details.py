@@ -0,0 +1,63 @@
+# test_application_details.py
+
+import json
+from datetime import datetime
+
+from database import Database
+from trade_finance import format_application_details
+
+
+def _stored_application(tmp_path, **updates):
+    db = Database(str(tmp_path / "trade_finance.db"))
+    db.add_applications([{
+        'application_id': 'TF-TEST-1',
+        'company_name': 'Acme Exports',
+        'contact_person': 'J. Doe',
+        'trade_type': 'Letter of Credit',
+        'finance_amount': 250000.0,
+        'payment_terms': '60 days',
+        'trade_description': 'Machine parts',
+        'counterparty_name': 'Globex',
+        'counterparty_country': 'Germany'
+    }])
+    if updates:
+        assert db.update_applications_batch([('TF-TEST-1', updates)])
+    [application] = db.get_applications()
+    return application
+
+
+def test_details_for_submitted_application(tmp_path):
+    text = format_application_details(_stored_application(tmp_path))
+    
+    assert "Application ID: TF-TEST-1" in text
+    assert "Company: Acme Exports" in text
+    assert "Contact: J. Doe" in text
+    assert "Amount: $250,000.00" in text
+    assert "Trade Description: Machine parts" in text
+    assert "Processed: N/A" in text
+    assert "Processing Results" not in text
+
+
+def test_details_include_processing_results(tmp_path):
+    results = {
+        'final_decision': {'decision': 'conditional_approval', 'final_score': 72.5,
+                           'conditions': ['Provide insurance certificate']},
+        'credit_assessment': {'credit_score': 70, 'credit_rating': 'BBB'}
+    }
+    application = _stored_application(tmp_path, status='conditional_approval', risk_level='low',
+                                      processing_results=json.dumps(results),
+                                      processed_at=datetime(2024, 1, 2, 3, 4, 5))
+    text = format_application_details(application)
+    
+    assert "Status: conditional_approval" in text
+    assert "Risk Level: low" in text
+    assert "Processed: 2024-01-02 03:04:05" in text
+    assert "Decision: conditional_approval" in text
+    assert "  - Provide insurance certificate" in text
+    assert "Credit Rating: BBB" in text
+
+
+def test_details_with_unparseable_results(tmp_path):
+    application = _stored_application(tmp_path, processing_results='{not json')
+    
+    assert "could not be parsed" in format_application_details(application)
@@ -1,23 +1,41 @@
 # trade_finance.py
 
+import os
 import sys
 import json
 import uuid
 import random
+import queue
+import threading
 import time
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
+from urllib.parse import urljoin
+import numpy as np
+import orjson
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QTextEdit, QComboBox, QSpinBox,
-    QTableWidget, QTableWidgetItem, QTabWidget, QGroupBox, QFormLayout,
+    QTableView, QAbstractItemView, QTabWidget, QGroupBox, QFormLayout,
     QProgressBar, QMessageBox, QHeaderView, QSplitter, QFrame,
-    QScrollArea, QGridLayout, QDoubleSpinBox, QDateEdit, QCheckBox
+    QScrollArea, QGridLayout, QDoubleSpinBox, QDateEdit, QCheckBox, QToolButton
 )
-from PyQt6.QtCore import QThread, pyqtSignal, QTimer, Qt, QDate
-from PyQt6.QtGui import QFont, QPalette, QColor
+from PyQt6.QtCore import (
+    QThread, QThreadPool, QRunnable, QObject, QAbstractTableModel, QModelIndex,
+    pyqtSignal, QTimer, Qt, QDate
+)
+from PyQt6.QtGui import QFont, QPalette, QColor, QBrush, QAction
 from database import Database
-from document_processor import DocumentProcessor
+from document_processor import OLLAMA_SESSION, DocumentProcessor
+from batch_scoring import (
+    COMPLIANCE_WEIGHTS, REVENUE_THRESHOLDS, RISK_LOW, RISK_NAMES, RISK_SPAN, RISK_WEIGHTS,
+    YEARS_THRESHOLDS, check_compliance_and_analyze_risk_batch, compliance_findings, compliance_status,
+    credit_factor_descriptions, credit_factors, credit_score_batch, draw_compliance_values,
+    quantize_finance_ratio, risk_level
+)
 import requests
 import logging
 
@@ -25,48 +43,476 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class TradeFinanceProcessingThread(QThread):
-    """Thread for processing trade finance applications"""
+# Rule-based credit assessment keywords, matched against _keyword_tokens()
+LOW_RISK_INDUSTRIES = frozenset({'technology', 'healthcare', 'education', 'utilities'})
+MEDIUM_RISK_INDUSTRIES = frozenset({'manufacturing', 'retail', 'services', 'agriculture'})
+HIGH_RISK_INDUSTRIES = frozenset({'oil', 'mining', 'construction', 'entertainment'})
+LOW_RISK_COUNTRIES = frozenset({'united states', 'canada', 'germany', 'japan', 'australia', 'uk', 'france'})
+MEDIUM_RISK_COUNTRIES = frozenset({'china', 'india', 'brazil', 'mexico', 'south korea', 'italy', 'spain'})
+
+# Credit history choice (lower-cased) -> code into batch_scoring's credit history tables;
+# anything else is 0 (unknown)
+CREDIT_HISTORY_CODES = {'excellent': 1, 'good': 2, 'fair': 3, 'poor': 4}
+
+# Lower score bound of each credit rating above 'D', ascending
+CREDIT_RATING_THRESHOLDS = (20, 30, 40, 50, 60, 70, 80, 85, 90)
+CREDIT_RATINGS = ('D', 'C', 'CC', 'CCC', 'B', 'BB', 'BBB', 'A', 'AA', 'AAA')
+
+# Final decision tiers, indexed by bisect_right(DECISION_THRESHOLDS, final_score):
+# (decision, conditions, compliance statuses allowed for the tier; None means any)
+DECISION_THRESHOLDS = (50, 65, 80)
+DECISION_TABLE = (
+    ('rejected', (
+        "Insufficient credit quality",
+        "High risk profile",
+        "Compliance concerns"
+    ), None),
+    ('manual_review', (
+        "Requires senior management approval",
+        "Additional due diligence required",
+        "Enhanced terms and conditions"
+    ), None),
+    ('conditional_approval', (
+        "Enhanced monitoring required",
+        "Additional documentation may be requested",
+        "Periodic review of credit status"
+    ), frozenset({'compliant', 'conditional'})),
+    ('approved', (), frozenset({'compliant'}))
+)
+
+_RNG = np.random.default_rng()
+_JSON_DECODER = json.JSONDecoder()
+
+# Prompt for the AI credit assessment, filled with str.format_map
+CREDIT_ASSESSMENT_PROMPT = """
+Analyze this trade finance application for creditworthiness:
+
+Company: {company_name}
+Industry: {industry}
+Annual Revenue: ${annual_revenue}
+Years in Business: {years_in_business}
+Credit History: {credit_history}
+Trade Finance Amount: ${finance_amount}
+Trade Type: {trade_type}
+Counterparty Country: {counterparty_country}
+Payment Terms: {payment_terms}
+
+Provide a credit assessment with:
+1. Credit score (0-100)
+2. Credit rating (AAA, AA, A, BBB, BB, B, CCC, CC, C, D)
+3. Key strengths
+4. Key risks
+5. Recommendations
+
+Respond in JSON format:
+{{
+    "credit_score": <score>,
+    "credit_rating": "<rating>",
+    "strengths": ["<strength1>", "<strength2>"],
+    "risks": ["<risk1>", "<risk2>"],
+    "recommendations": ["<rec1>", "<rec2>"],
+    "confidence": <confidence_score>
+}}
+"""
+
+# Ollama connectivity, probed at most once per OLLAMA_PROBE_TTL seconds so that an
+# offline server costs each application nothing instead of a connect timeout
+OLLAMA_PROBE_TIMEOUT = 0.5
+OLLAMA_PROBE_TTL = 30.0
+_OLLAMA_PROBES: Dict[str, Dict[str, Any]] = {}  # tags URL -> {'ok', 'checked_at', 'ready'}
+_OLLAMA_PROBES_LOCK = threading.Lock()
+
+# Long-lived workers for the per-application AI stages, so processing an application
+# does not start and stop threads of its own
+_AI_STAGE_EXECUTOR = ThreadPoolExecutor(thread_name_prefix='ai-stage')
+
+def _ollama_num_parallel(default: int = 4) -> int:
+    """Processing pool size from OLLAMA_NUM_PARALLEL, at least 1; default if unset or invalid"""
+    value = os.environ.get('OLLAMA_NUM_PARALLEL')
+    if value is None:
+        return default
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        logger.warning(f"Ignoring invalid OLLAMA_NUM_PARALLEL={value!r}, using {default}")
+        return default
+
+def _ollama_available(generate_url: str) -> bool:
+    """Whether the Ollama server behind generate_url answered the most recent (cached) probe.
+    
+    Only the caller that finds the answer expired probes, outside the lock; the others keep
+    the previous answer, or wait for the first one, instead of queueing behind its connect.
+    """
+    tags_url = urljoin(generate_url, '/api/tags')
+    with _OLLAMA_PROBES_LOCK:
+        state = _OLLAMA_PROBES.get(tags_url)
+        if state is None:
+            state = _OLLAMA_PROBES[tags_url] = {'ok': None, 'checked_at': None, 'ready': threading.Event()}
+        now = time.monotonic()
+        should_probe = state['checked_at'] is None or now - state['checked_at'] >= OLLAMA_PROBE_TTL
+        if should_probe:
+            state['checked_at'] = now
+    
+    if not should_probe:
+        state['ready'].wait()
+        return state['ok']
+    
+    ok = False
+    try:
+        response = OLLAMA_SESSION.head(tags_url, timeout=OLLAMA_PROBE_TIMEOUT)
+        ok = response.status_code < 500
+    except requests.RequestException:
+        pass
+    finally:
+        state['ok'] = ok
+        state['ready'].set()
+    
+    if not ok:
+        logger.warning(f"Ollama unavailable, using rule-based assessment for {OLLAMA_PROBE_TTL:.0f}s")
+    return ok
+
+def _read_streamed_json_response(response: requests.Response) -> str:
+    """Collect a streamed Ollama completion, closing the stream once the first JSON object closes"""
+    parts = []
+    depth = 0
+    seen_open = False
+    in_string = False
+    escaped = False
+    
+    try:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            
+            chunk = json.loads(line)
+            piece = chunk.get('response', '')
+            parts.append(piece)
+            
+            for char in piece:
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '{':
+                    depth += 1
+                    seen_open = True
+                elif seen_open and char == '"':
+                    in_string = True
+                elif seen_open and char == '}':
+                    depth -= 1
+                    if depth == 0:
+                        return ''.join(parts)
+            
+            if chunk.get('done'):
+                break
+    finally:
+        response.close()
+    
+    return ''.join(parts)
+
+def _keyword_tokens(text: str) -> Set[str]:
+    """Lower-cased words of text plus adjacent word pairs, for multi-word keywords"""
+    words = text.lower().split()
+    tokens = set(words)
+    tokens.update(' '.join(pair) for pair in zip(words, words[1:]))
+    return tokens
+
+def _encode_credit_inputs(application_data: Dict[str, Any]) -> Tuple[int, int, int, int, int, int]:
+    """Reduce an application to the small integer codes the rule-based credit assessment scores:
+    (industry code, country code, years bucket, revenue bucket, credit history code, finance ratio)
+    """
+    revenue = float(application_data.get('annual_revenue', 0))
+    years = int(application_data.get('years_in_business', 0))
+    finance_amount = float(application_data.get('finance_amount', 0))
+    credit_history = application_data.get('credit_history', '').strip().lower()
+    
+    industry_tokens = _keyword_tokens(application_data.get('industry', ''))
+    if not LOW_RISK_INDUSTRIES.isdisjoint(industry_tokens):
+        industry_code = 1
+    elif not MEDIUM_RISK_INDUSTRIES.isdisjoint(industry_tokens):
+        industry_code = 2
+    elif not HIGH_RISK_INDUSTRIES.isdisjoint(industry_tokens):
+        industry_code = 3
+    else:
+        industry_code = 0
+    
+    country_tokens = _keyword_tokens(application_data.get('counterparty_country', ''))
+    if not LOW_RISK_COUNTRIES.isdisjoint(country_tokens):
+        country_code = 1
+    elif not MEDIUM_RISK_COUNTRIES.isdisjoint(country_tokens):
+        country_code = 2
+    else:
+        country_code = 0
+    
+    return (
+        industry_code,
+        country_code,
+        bisect_right(YEARS_THRESHOLDS, years),
+        bisect_right(REVENUE_THRESHOLDS, revenue),
+        CREDIT_HISTORY_CODES.get(credit_history, 0),
+        quantize_finance_ratio(finance_amount, revenue)
+    )
+
+class PendingApplications:
+    """Applications queued for processing, held as parallel columns (struct of arrays).
+    
+    Each submitted form dict is converted once by append(); scoring then reads the
+    numeric and encoded credit columns by index, a whole batch at a time. The original
+    dict stays available through record() for the AI prompts and document checks.
+    
+    Applications are appended on the GUI thread and released from processing threads.
+    Once every appended application has been released the store is emptied, so
+    indices restart at 0 and the arrays are reused rather than growing for the session.
+    """
+    
+    # Encoded rule-based credit inputs, in _encode_credit_inputs() order
+    CREDIT_COLUMNS = ('industry_code', 'country_code', 'years_bucket', 'revenue_bucket',
+                      'credit_history_code', 'finance_ratio_q')
+    ARRAY_COLUMNS = ('revenue', 'years', 'finance_amount') + CREDIT_COLUMNS
+    
+    def __init__(self, capacity: int = 64):
+        self._lock = threading.Lock()
+        self._outstanding = 0  # appended but not yet released
+        
+        self.application_id: List[str] = []
+        self.company_name: List[str] = []
+        self.records: List[Optional[Dict[str, Any]]] = []
+        
+        self.revenue = np.empty(capacity, dtype=np.float64)
+        self.years = np.empty(capacity, dtype=np.int32)
+        self.finance_amount = np.empty(capacity, dtype=np.float64)
+        self.industry_code = np.empty(capacity, dtype=np.int8)
+        self.country_code = np.empty(capacity, dtype=np.int8)
+        self.years_bucket = np.empty(capacity, dtype=np.int8)
+        self.revenue_bucket = np.empty(capacity, dtype=np.int8)
+        self.credit_history_code = np.empty(capacity, dtype=np.int8)
+        self.finance_ratio_q = np.empty(capacity, dtype=np.int16)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def append(self, application_data: Dict[str, Any]) -> int:
+        """Add an application and return its index"""
+        revenue = float(application_data.get('annual_revenue', 0))
+        years = int(application_data.get('years_in_business', 0))
+        finance_amount = float(application_data.get('finance_amount', 0))
+        credit_codes = _encode_credit_inputs(application_data)
+        
+        with self._lock:
+            index = len(self.records)
+            if index == len(self.revenue):
+                self._grow()
+            
+            self.revenue[index] = revenue
+            self.years[index] = years
+            self.finance_amount[index] = finance_amount
+            for name, code in zip(self.CREDIT_COLUMNS, credit_codes):
+                getattr(self, name)[index] = code
+            
+            self.application_id.append(application_data.get('application_id'))
+            self.company_name.append(application_data.get('company_name', ''))
+            self.records.append(application_data)
+            self._outstanding += 1
+        return index
+    
+    def _grow(self):
+        """Double the capacity of every array column"""
+        count = len(self.records)
+        for name in self.ARRAY_COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(max(2 * len(column), 1), dtype=column.dtype)
+            grown[:count] = column[:count]
+            setattr(self, name, grown)
+    
+    def record(self, index: int) -> Dict[str, Any]:
+        """The submitted form dict for an application"""
+        return self.records[index]
+    
+    def release(self, index: int):
+        """Drop the form dict of a processed application, emptying the store after the last one"""
+        with self._lock:
+            self.records[index] = None
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                # Nothing refers to an index any more; keep the arrays' capacity
+                self.application_id.clear()
+                self.company_name.clear()
+                self.records.clear()
+    
+    def credit_codes(self, index: int) -> Tuple[int, int, int, int, int, int]:
+        """Encoded rule-based credit inputs for one application"""
+        return tuple(int(getattr(self, name)[index]) for name in self.CREDIT_COLUMNS)
+    
+    def credit_scores(self, indices: List[int]) -> np.ndarray:
+        """Rule-based credit scores (int16) for the given applications in one kernel call"""
+        selected = np.asarray(indices, dtype=np.intp)
+        return credit_score_batch(*(getattr(self, name)[selected] for name in self.CREDIT_COLUMNS))
+
+# Fixed choices for the application form's combo boxes
+INDUSTRY_OPTIONS = (
+    "Manufacturing", "Technology", "Healthcare", "Retail", "Agriculture",
+    "Oil & Gas", "Mining", "Construction", "Services", "Other"
+)
+TRADE_TYPE_OPTIONS = (
+    "Letter of Credit", "Documentary Collection", "Trade Loan",
+    "Export Financing", "Import Financing", "Supply Chain Finance"
+)
+COUNTRY_OPTIONS = (
+    "United States", "Canada", "United Kingdom", "Germany", "France",
+    "China", "Japan", "India", "Brazil", "Mexico", "Australia", "Other"
+)
+PAYMENT_TERMS_OPTIONS = ("30 days", "60 days", "90 days", "120 days", "180 days", "Other")
+CREDIT_HISTORY_OPTIONS = ("Excellent", "Good", "Fair", "Poor", "Unknown")
+
+class DatabaseWriterThread(QThread):
+    """Thread that persists processing results, grouping queued updates into one transaction"""
+    
+    results_written = pyqtSignal(list)  # application_ids
+    results_failed = pyqtSignal(list)  # application_ids whose results could not be saved
+    
+    def __init__(self, db: Database, max_batch_size: int = 32):
+        super().__init__()
+        self.db = db
+        self.max_batch_size = max_batch_size
+        self.write_queue: queue.Queue = queue.Queue()
+    
+    def submit(self, application_id: str, updates: Dict[str, Any]):
+        """Queue an application update for the next batch"""
+        self.write_queue.put((application_id, updates))
+    
+    def stop(self):
+        """Flush pending updates and stop the thread"""
+        self.write_queue.put(None)
+        self.wait()
+    
+    def run(self):
+        """Write queued updates until stopped"""
+        stopping = False
+        while not stopping:
+            record = self.write_queue.get()
+            if record is None:
+                break
+            
+            # Drain whatever else is already queued, up to the batch size
+            batch = [record]
+            while len(batch) < self.max_batch_size:
+                try:
+                    record = self.write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            
+            if self.db.update_applications_batch(batch):
+                self.results_written.emit([application_id for application_id, _ in batch])
+                continue
+            
+            # One bad update rolls back the whole transaction, so retry the batch item by item
+            logger.error(f"Failed to write results for {len(batch)} applications, retrying individually")
+            written, failed = [], []
+            for application_id, updates in batch:
+                if self.db.update_applications_batch([(application_id, updates)]):
+                    written.append(application_id)
+                else:
+                    failed.append(application_id)
+            if written:
+                self.results_written.emit(written)
+            if failed:
+                logger.error(f"Failed to write results for applications: {', '.join(failed)}")
+                self.results_failed.emit(failed)
+
+class ProcessingSignals(QObject):
+    """Signals emitted by TradeFinanceRunnable (QRunnable is not a QObject)"""
     
     progress_updated = pyqtSignal(str, str, int)  # application_id, status, progress
     processing_completed = pyqtSignal(str, dict)  # application_id, results
+
+class TradeFinanceRunnable(QRunnable):
+    """Thread pool task for processing trade finance applications"""
     
-    def __init__(self, application_data: Dict[str, Any], db: Database, doc_processor: DocumentProcessor):
+    def __init__(self, batch: PendingApplications, indices: List[int], db: Database,
+                 doc_processor: DocumentProcessor, db_writer: Optional[DatabaseWriterThread] = None,
+                 signals: Optional[ProcessingSignals] = None):
         super().__init__()
-        self.application_data = application_data
+        # Pass a long-lived signals object to let the pool delete the task when it finishes
+        self.signals = signals if signals is not None else ProcessingSignals()
+        self.batch = batch
+        self.indices = indices
         self.db = db
         self.doc_processor = doc_processor
-        self.application_id = application_data.get('application_id')
+        self.db_writer = db_writer
+        
+        # The application currently being processed, and its batch rule-based credit score
+        self.index = indices[0]
+        self.application_data = batch.record(self.index)
+        self.application_id = batch.application_id[self.index]
+        self.credit_score: Optional[int] = None
     
     def run(self):
-        """Process trade finance application"""
+        """Score compliance, risk and rule-based credit for the whole batch at once,
+        then process each application in turn"""
+        released = 0
+        try:
+            try:
+                compliance_batch, risk_batch = check_compliance_and_analyze_risk_batch(len(self.indices))
+            except Exception as e:
+                # Fall back to scoring each application on its own
+                logger.error(f"Batch compliance and risk scoring error: {str(e)}")
+                compliance_batch = risk_batch = [None] * len(self.indices)
+            
+            try:
+                credit_scores = [int(score) for score in self.batch.credit_scores(self.indices)]
+            except Exception as e:
+                logger.error(f"Batch credit scoring error: {str(e)}")
+                credit_scores = [None] * len(self.indices)
+            
+            for index, compliance_results, risk_results, credit_score in zip(
+                    self.indices, compliance_batch, risk_batch, credit_scores):
+                self.index = index
+                self.application_data = self.batch.record(index)
+                self.application_id = self.batch.application_id[index]
+                self.credit_score = credit_score
+                self.process_application(compliance_results, risk_results)
+                self.batch.release(index)
+                released += 1
+        finally:
+            # Hand back any applications an unexpected error left unprocessed, so the store can empty
+            for index in self.indices[released:]:
+                self.batch.release(index)
+    
+    def process_application(self, compliance_results: Optional[Dict[str, Any]] = None,
+                            risk_results: Optional[Dict[str, Any]] = None):
+        """Process trade finance application, using batch compliance and risk results when given"""
         try:
             logger.info(f"Starting processing for application {self.application_id}")
             
-            # Step 1: Document Verification (20%)
-            self.progress_updated.emit(self.application_id, "Document Verification", 20)
-            time.sleep(2)
-            doc_results = self.verify_documents()
-            
-            # Step 2: Credit Assessment (40%)
-            self.progress_updated.emit(self.application_id, "Credit Assessment", 40)
-            time.sleep(2)
-            credit_results = self.assess_credit()
+            # Steps 1-2: Document Verification & Credit Assessment (40%)
+            # Both may call Ollama and are independent, so run them concurrently
+            doc_future = _AI_STAGE_EXECUTOR.submit(self.verify_documents)
+            credit_future = _AI_STAGE_EXECUTOR.submit(self.assess_credit)
+            doc_results = doc_future.result()
+            credit_results = credit_future.result()
+            self.signals.progress_updated.emit(self.application_id, "Document Verification & Credit Assessment", 40)
             
             # Step 3: Compliance Check (60%)
-            self.progress_updated.emit(self.application_id, "Compliance Check", 60)
-            time.sleep(2)
-            compliance_results = self.check_compliance()
+            self.signals.progress_updated.emit(self.application_id, "Compliance Check", 60)
+            if compliance_results is None:
+                compliance_results = self.check_compliance()
             
             # Step 4: Risk Analysis (80%)
-            self.progress_updated.emit(self.application_id, "Risk Analysis", 80)
-            time.sleep(2)
-            risk_results = self.analyze_risk()
+            self.signals.progress_updated.emit(self.application_id, "Risk Analysis", 80)
+            if risk_results is None:
+                risk_results = self.analyze_risk()
             
             # Step 5: Final Decision (100%)
-            self.progress_updated.emit(self.application_id, "Final Decision", 100)
-            time.sleep(1)
-            final_decision = self.make_final_decision(doc_results, credit_results, compliance_results, risk_results)
+            self.signals.progress_updated.emit(self.application_id, "Final Decision", 100)
+            now = datetime.now()
+            final_decision = self.make_final_decision(doc_results, credit_results, compliance_results, risk_results, now)
             
             # Combine all results
             complete_results = {
@@ -75,19 +521,22 @@ class TradeFinanceProcessingThread(QThread):
                 'compliance_check': compliance_results,
                 'risk_analysis': risk_results,
                 'final_decision': final_decision,
-                'processing_completed_at': datetime.now().isoformat()
+                'processing_completed_at': now.isoformat()
             }
             
-            # Update database
-            new_status = final_decision.get('decision', 'pending')
-            self.db.update_application_status(self.application_id, new_status)
-            self.db.update_application_results(
-                self.application_id,
-                processing_results=json.dumps(complete_results),
-                risk_level=risk_results.get('risk_level', 'medium')
-            )
+            # Update database, via the batched writer when one is available
+            updates = {
+                'status': final_decision.get('decision', 'pending'),
+                'processing_results': orjson.dumps(complete_results).decode(),
+                'risk_level': risk_results.get('risk_level', 'medium'),
+                'processed_at': now
+            }
+            if self.db_writer is not None:
+                self.db_writer.submit(self.application_id, updates)
+            else:
+                self.db.update_applications_batch([(self.application_id, updates)])
             
-            self.processing_completed.emit(self.application_id, complete_results)
+            self.signals.processing_completed.emit(self.application_id, complete_results)
             logger.info(f"Processing completed for application {self.application_id}")
             
         except Exception as e:
@@ -97,13 +546,16 @@ class TradeFinanceProcessingThread(QThread):
                 'status': 'processing_error',
                 'timestamp': datetime.now().isoformat()
             }
-            self.processing_completed.emit(self.application_id, error_results)
+            self.signals.processing_completed.emit(self.application_id, error_results)
     
     def verify_documents(self) -> Dict[str, Any]:
         """Verify trade finance documents"""
         try:
             # Use AI-powered document verification if available
-            ai_results = self.doc_processor.verify_documents_ai(self.application_data)
+            if _ollama_available(self.doc_processor.ollama_url):
+                ai_results = self.doc_processor.verify_documents_ai(self.application_data)
+            else:
+                ai_results = {'success': False, 'error': 'ollama_unavailable'}
             
             if ai_results.get('success'):
                 return ai_results
@@ -159,65 +611,42 @@ class TradeFinanceProcessingThread(QThread):
     def get_ai_credit_assessment(self) -> Dict[str, Any]:
         """Get AI-powered credit assessment"""
         try:
-            # Prepare prompt for AI assessment
-            prompt = f"""
-Analyze this trade finance application for creditworthiness:
-
-Company: {self.application_data.get('company_name', 'N/A')}
-Industry: {self.application_data.get('industry', 'N/A')}
-Annual Revenue: ${self.application_data.get('annual_revenue', 0):,.2f}
-Years in Business: {self.application_data.get('years_in_business', 0)}
-Credit History: {self.application_data.get('credit_history', 'N/A')}
-Trade Finance Amount: ${self.application_data.get('finance_amount', 0):,.2f}
-Trade Type: {self.application_data.get('trade_type', 'N/A')}
-Counterparty Country: {self.application_data.get('counterparty_country', 'N/A')}
-Payment Terms: {self.application_data.get('payment_terms', 'N/A')}
-
-Provide a credit assessment with:
-1. Credit score (0-100)
-2. Credit rating (AAA, AA, A, BBB, BB, B, CCC, CC, C, D)
-3. Key strengths
-4. Key risks
-5. Recommendations
-
-Respond in JSON format:
-{{
-    "credit_score": <score>,
-    "credit_rating": "<rating>",
-    "strengths": ["<strength1>", "<strength2>"],
-    "risks": ["<risk1>", "<risk2>"],
-    "recommendations": ["<rec1>", "<rec2>"],
-    "confidence": <confidence_score>
-}}
-"""
-            
-            # Call Ollama API
-            response = requests.post(
-                'http://localhost:11434/api/generate',
+            if not _ollama_available(self.doc_processor.ollama_url):
+                return {'success': False, 'error': 'ollama_unavailable'}
+            
+            # Prepare prompt for AI assessment; missing text fields render as N/A
+            prompt_fields = defaultdict(lambda: 'N/A', self.application_data)
+            prompt_fields['annual_revenue'] = f"{self.application_data.get('annual_revenue', 0):,.2f}"
+            prompt_fields['finance_amount'] = f"{self.application_data.get('finance_amount', 0):,.2f}"
+            prompt_fields['years_in_business'] = self.application_data.get('years_in_business', 0)
+            prompt = CREDIT_ASSESSMENT_PROMPT.format_map(prompt_fields)
+            
+            # Call Ollama API, streaming so we can stop once the JSON object is complete
+            response = OLLAMA_SESSION.post(
+                self.doc_processor.ollama_url,
                 json={
                     'model': 'llama3.2',
                     'prompt': prompt,
-                    'stream': False,
+                    'stream': True,
                     'options': {
                         'temperature': 0.3,
                         'top_p': 0.9
                     }
                 },
-                timeout=30
+                timeout=30,
+                stream=True
             )
             
             if response.status_code == 200:
-                ai_response = response.json().get('response', '')
+                ai_response = _read_streamed_json_response(response)
                 
                 # Parse JSON response
                 try:
-                    # Extract JSON from response
+                    # Decode the first JSON object in the response, ignoring any trailing text
                     json_start = ai_response.find('{')
-                    json_end = ai_response.rfind('}') + 1
                     
-                    if json_start != -1 and json_end != -1:
-                        json_str = ai_response[json_start:json_end]
-                        ai_result = json.loads(json_str)
+                    if json_start != -1:
+                        ai_result, _ = _JSON_DECODER.raw_decode(ai_response, json_start)
                         
                         return {
                             'success': True,
@@ -237,6 +666,7 @@ Respond in JSON format:
                     logger.warning(f"Failed to parse AI credit assessment: {str(e)}")
                     return {'success': False, 'error': f"JSON parsing error: {str(e)}"}
             else:
+                response.close()
                 logger.warning(f"AI credit assessment failed: HTTP {response.status_code}")
                 return {'success': False, 'error': f"HTTP {response.status_code}"}
                 
@@ -250,113 +680,14 @@ Respond in JSON format:
     def get_rule_based_credit_assessment(self) -> Dict[str, Any]:
         """Get rule-based credit assessment"""
         try:
-            score = 0
-            factors = []
-            
-            # Annual revenue factor (0-25 points)
-            revenue = float(self.application_data.get('annual_revenue', 0))
-            if revenue >= 10000000:  # $10M+
-                score += 25
-                factors.append("Strong revenue base ($10M+)")
-            elif revenue >= 5000000:  # $5M+
-                score += 20
-                factors.append("Good revenue base ($5M+)")
-            elif revenue >= 1000000:  # $1M+
-                score += 15
-                factors.append("Moderate revenue base ($1M+)")
-            elif revenue >= 500000:  # $500K+
-                score += 10
-                factors.append("Limited revenue base ($500K+)")
-            else:
-                score += 5
-                factors.append("Low revenue base (<$500K)")
-            
-            # Years in business factor (0-20 points)
-            years = int(self.application_data.get('years_in_business', 0))
-            if years >= 10:
-                score += 20
-                factors.append("Established business (10+ years)")
-            elif years >= 5:
-                score += 15
-                factors.append("Mature business (5+ years)")
-            elif years >= 2:
-                score += 10
-                factors.append("Growing business (2+ years)")
-            else:
-                score += 5
-                factors.append("New business (<2 years)")
-            
-            # Credit history factor (0-20 points)
-            credit_history = self.application_data.get('credit_history', '').lower()
-            if 'excellent' in credit_history:
-                score += 20
-                factors.append("Excellent credit history")
-            elif 'good' in credit_history:
-                score += 15
-                factors.append("Good credit history")
-            elif 'fair' in credit_history:
-                score += 10
-                factors.append("Fair credit history")
-            elif 'poor' in credit_history:
-                score += 5
-                factors.append("Poor credit history")
+            # Revenue (5-25), years in business (5-20), credit history (5-20),
+            # financing ratio (3-15), industry (4-10) and country (4-10) points,
+            # scored for the whole batch by run() unless that failed
+            credit_codes = self.batch.credit_codes(self.index)
+            if self.credit_score is not None:
+                score, factors = self.credit_score, credit_factor_descriptions(*credit_codes)
             else:
-                score += 10
-                factors.append("Unknown credit history")
-            
-            # Finance amount vs revenue ratio (0-15 points)
-            finance_amount = float(self.application_data.get('finance_amount', 0))
-            if revenue > 0:
-                ratio = finance_amount / revenue
-                if ratio <= 0.1:  # 10% or less
-                    score += 15
-                    factors.append("Conservative financing ratio (≤10%)")
-                elif ratio <= 0.25:  # 25% or less
-                    score += 12
-                    factors.append("Moderate financing ratio (≤25%)")
-                elif ratio <= 0.5:  # 50% or less
-                    score += 8
-                    factors.append("High financing ratio (≤50%)")
-                else:
-                    score += 3
-                    factors.append("Very high financing ratio (>50%)")
-            else:
-                score += 5
-                factors.append("Unable to assess financing ratio")
-            
-            # Industry risk factor (0-10 points)
-            industry = self.application_data.get('industry', '').lower()
-            low_risk_industries = ['technology', 'healthcare', 'education', 'utilities']
-            medium_risk_industries = ['manufacturing', 'retail', 'services', 'agriculture']
-            high_risk_industries = ['oil', 'mining', 'construction', 'entertainment']
-            
-            if any(ind in industry for ind in low_risk_industries):
-                score += 10
-                factors.append("Low-risk industry")
-            elif any(ind in industry for ind in medium_risk_industries):
-                score += 7
-                factors.append("Medium-risk industry")
-            elif any(ind in industry for ind in high_risk_industries):
-                score += 4
-                factors.append("High-risk industry")
-            else:
-                score += 6
-                factors.append("Unknown industry risk")
-            
-            # Country risk factor (0-10 points)
-            country = self.application_data.get('counterparty_country', '').lower()
-            low_risk_countries = ['united states', 'canada', 'germany', 'japan', 'australia', 'uk', 'france']
-            medium_risk_countries = ['china', 'india', 'brazil', 'mexico', 'south korea', 'italy', 'spain']
-            
-            if any(c in country for c in low_risk_countries):
-                score += 10
-                factors.append("Low country risk")
-            elif any(c in country for c in medium_risk_countries):
-                score += 7
-                factors.append("Medium country risk")
-            else:
-                score += 4
-                factors.append("High country risk")
+                score, factors = credit_factors(*credit_codes)
             
             # Determine credit rating
             credit_rating = self.get_credit_rating(score)
@@ -381,76 +712,20 @@ Respond in JSON format:
     
     def get_credit_rating(self, score: float) -> str:
         """Convert credit score to rating"""
-        if score >= 90:
-            return 'AAA'
-        elif score >= 85:
-            return 'AA'
-        elif score >= 80:
-            return 'A'
-        elif score >= 70:
-            return 'BBB'
-        elif score >= 60:
-            return 'BB'
-        elif score >= 50:
-            return 'B'
-        elif score >= 40:
-            return 'CCC'
-        elif score >= 30:
-            return 'CC'
-        elif score >= 20:
-            return 'C'
-        else:
-            return 'D'
+        return CREDIT_RATINGS[bisect_right(CREDIT_RATING_THRESHOLDS, score)]
     
     def check_compliance(self) -> Dict[str, Any]:
         """Check regulatory compliance"""
         try:
-            compliance_score = 0
-            checks = []
-            issues = []
-            
-            # KYC/AML checks
-            kyc_score = random.uniform(0.7, 1.0)  # Simulate KYC check
-            compliance_score += kyc_score * 30
-            checks.append(f"KYC/AML: {kyc_score:.2f}")
-            
-            if kyc_score < 0.8:
-                issues.append("KYC documentation incomplete")
-            
-            # Sanctions screening
-            sanctions_clear = random.choice([True, True, True, False])  # 75% pass rate
-            if sanctions_clear:
-                compliance_score += 25
-                checks.append("Sanctions screening: CLEAR")
-            else:
-                checks.append("Sanctions screening: FLAGGED")
-                issues.append("Potential sanctions match found")
-            
-            # Export/Import regulations
-            trade_compliance = random.uniform(0.8, 1.0)
-            compliance_score += trade_compliance * 25
-            checks.append(f"Trade compliance: {trade_compliance:.2f}")
-            
-            # Documentation completeness
-            doc_completeness = random.uniform(0.7, 1.0)
-            compliance_score += doc_completeness * 20
-            checks.append(f"Documentation: {doc_completeness:.2f}")
-            
-            if doc_completeness < 0.9:
-                issues.append("Some documentation missing or incomplete")
-            
-            # Determine compliance status
-            if compliance_score >= 85 and not issues:
-                status = 'compliant'
-            elif compliance_score >= 70:
-                status = 'conditional'
-            else:
-                status = 'non_compliant'
+            # KYC/AML, sanctions screening, trade compliance and documentation in one draw
+            compliance_values = draw_compliance_values(1)[0]
+            compliance_score = float(compliance_values @ COMPLIANCE_WEIGHTS)
+            checks, issues = compliance_findings(compliance_values)
             
             return {
                 'success': True,
                 'compliance_score': round(compliance_score, 2),
-                'status': status,
+                'status': compliance_status(compliance_score, bool(issues)),
                 'checks': checks,
                 'issues': issues,
                 'method': 'automated'
@@ -469,50 +744,15 @@ Respond in JSON format:
     def analyze_risk(self) -> Dict[str, Any]:
         """Analyze overall risk"""
         try:
-            risk_factors = []
-            risk_score = 0
-            
-            # Market risk
-            market_risk = random.uniform(0.1, 0.8)
-            risk_score += market_risk * 25
-            risk_factors.append(f"Market risk: {market_risk:.2f}")
-            
-            # Credit risk
-            credit_risk = random.uniform(0.1, 0.7)
-            risk_score += credit_risk * 30
-            risk_factors.append(f"Credit risk: {credit_risk:.2f}")
-            
-            # Operational risk
-            operational_risk = random.uniform(0.1, 0.6)
-            risk_score += operational_risk * 20
-            risk_factors.append(f"Operational risk: {operational_risk:.2f}")
-            
-            # Country risk
-            country_risk = random.uniform(0.1, 0.9)
-            risk_score += country_risk * 15
-            risk_factors.append(f"Country risk: {country_risk:.2f}")
-            
-            # Currency risk
-            currency_risk = random.uniform(0.1, 0.5)
-            risk_score += currency_risk * 10
-            risk_factors.append(f"Currency risk: {currency_risk:.2f}")
-            
-            # Determine risk level
-            if risk_score <= 25:
-                risk_level = 'very_low'
-            elif risk_score <= 40:
-                risk_level = 'low'
-            elif risk_score <= 60:
-                risk_level = 'medium'
-            elif risk_score <= 80:
-                risk_level = 'high'
-            else:
-                risk_level = 'very_high'
+            # Draw all risk components at once, each uniform over [low, low + span)
+            risk_draws = RISK_LOW + _RNG.random(len(RISK_NAMES)) * RISK_SPAN
+            risk_score = float(risk_draws @ RISK_WEIGHTS)
+            risk_factors = [f"{name}: {value:.2f}" for name, value in zip(RISK_NAMES, risk_draws)]
             
             return {
                 'success': True,
                 'risk_score': round(risk_score, 2),
-                'risk_level': risk_level,
+                'risk_level': risk_level(risk_score),
                 'risk_factors': risk_factors,
                 'method': 'comprehensive'
             }
@@ -528,8 +768,12 @@ Respond in JSON format:
             }
     
     def make_final_decision(self, doc_results: Dict, credit_results: Dict, 
-                          compliance_results: Dict, risk_results: Dict) -> Dict[str, Any]:
+                          compliance_results: Dict, risk_results: Dict,
+                          now: Optional[datetime] = None) -> Dict[str, Any]:
         """Make final approval decision"""
+        if now is None:
+            now = datetime.now()
+        
         try:
             # Calculate weighted score
             doc_score = doc_results.get('score', 0) if doc_results.get('success') else 0
@@ -541,38 +785,20 @@ Respond in JSON format:
             final_score = (doc_score * 0.2 + credit_score * 0.4 + 
                           compliance_score * 0.25 + risk_score * 0.15)
             
-            # Decision logic
-            if final_score >= 80 and compliance_results.get('status') == 'compliant':
-                decision = 'approved'
-                conditions = []
-            elif final_score >= 65 and compliance_results.get('status') in ['compliant', 'conditional']:
-                decision = 'conditional_approval'
-                conditions = [
-                    "Enhanced monitoring required",
-                    "Additional documentation may be requested",
-                    "Periodic review of credit status"
-                ]
-            elif final_score >= 50:
-                decision = 'manual_review'
-                conditions = [
-                    "Requires senior management approval",
-                    "Additional due diligence required",
-                    "Enhanced terms and conditions"
-                ]
-            else:
-                decision = 'rejected'
-                conditions = [
-                    "Insufficient credit quality",
-                    "High risk profile",
-                    "Compliance concerns"
-                ]
+            # Decision logic: tier from score, capped by the compliance status
+            status = compliance_results.get('status')
+            tier = bisect_right(DECISION_THRESHOLDS, final_score)
+            decision, conditions, allowed_statuses = DECISION_TABLE[tier]
+            while allowed_statuses is not None and status not in allowed_statuses:
+                tier -= 1
+                decision, conditions, allowed_statuses = DECISION_TABLE[tier]
             
             return {
                 'decision': decision,
                 'final_score': round(final_score, 2),
                 'conditions': conditions,
-                'decision_date': datetime.now().isoformat(),
-                'valid_until': (datetime.now() + timedelta(days=30)).isoformat()
+                'decision_date': now.isoformat(),
+                'valid_until': (now + timedelta(days=30)).isoformat()
             }
             
         except Exception as e:
@@ -581,15 +807,39 @@ Respond in JSON format:
                 'decision': 'manual_review',
                 'final_score': 0,
                 'conditions': [f"Processing error: {str(e)}"],
-                'decision_date': datetime.now().isoformat(),
+                'decision_date': now.isoformat(),
                 'error': str(e)
             }
 
+# (read value, reset) for each kind of application form widget
+_TEXT_FIELD = (lambda widget: widget.text().strip(), lambda widget: widget.clear())
+_CHOICE_FIELD = (lambda widget: widget.currentText(), lambda widget: widget.setCurrentIndex(0))
+_NUMBER_FIELD = (lambda widget: widget.value(), lambda widget: widget.setValue(0))
+_PLAIN_TEXT_FIELD = (lambda widget: widget.toPlainText().strip(), lambda widget: widget.clear())
+
 class TradeFinanceApplicationWindow(QWidget):
     """Window for submitting trade finance applications"""
     
     application_submitted = pyqtSignal(dict)
     
+    # Form fields, in application_data order: (key and widget attribute, read value, reset)
+    _FIELDS = (
+        ('company_name', *_TEXT_FIELD),
+        ('industry', *_CHOICE_FIELD),
+        ('annual_revenue', *_NUMBER_FIELD),
+        ('years_in_business', *_NUMBER_FIELD),
+        ('trade_type', *_CHOICE_FIELD),
+        ('finance_amount', *_NUMBER_FIELD),
+        ('counterparty_name', *_TEXT_FIELD),
+        ('counterparty_country', *_CHOICE_FIELD),
+        ('payment_terms', *_CHOICE_FIELD),
+        ('credit_history', *_CHOICE_FIELD),
+        ('existing_facilities', *_NUMBER_FIELD),
+        ('collateral_offered', *_TEXT_FIELD),
+        ('purpose', *_PLAIN_TEXT_FIELD),
+        ('special_requirements', *_PLAIN_TEXT_FIELD)
+    )
+    
     def __init__(self):
         super().__init__()
         self.init_ui()
@@ -618,10 +868,7 @@ class TradeFinanceApplicationWindow(QWidget):
         
         self.company_name = QLineEdit()
         self.industry = QComboBox()
-        self.industry.addItems([
-            "Manufacturing", "Technology", "Healthcare", "Retail", "Agriculture",
-            "Oil & Gas", "Mining", "Construction", "Services", "Other"
-        ])
+        self.industry.addItems(INDUSTRY_OPTIONS)
         self.annual_revenue = QDoubleSpinBox()
         self.annual_revenue.setRange(0, 999999999)
         self.annual_revenue.setSuffix(" USD")
@@ -641,23 +888,15 @@ class TradeFinanceApplicationWindow(QWidget):
         trade_layout = QFormLayout()
         
         self.trade_type = QComboBox()
-        self.trade_type.addItems([
-            "Letter of Credit", "Documentary Collection", "Trade Loan", 
-            "Export Financing", "Import Financing", "Supply Chain Finance"
-        ])
+        self.trade_type.addItems(TRADE_TYPE_OPTIONS)
         self.finance_amount = QDoubleSpinBox()
         self.finance_amount.setRange(0, 999999999)
         self.finance_amount.setSuffix(" USD")
         self.counterparty_name = QLineEdit()
         self.counterparty_country = QComboBox()
-        self.counterparty_country.addItems([
-            "United States", "Canada", "United Kingdom", "Germany", "France",
-            "China", "Japan", "India", "Brazil", "Mexico", "Australia", "Other"
-        ])
+        self.counterparty_country.addItems(COUNTRY_OPTIONS)
         self.payment_terms = QComboBox()
-        self.payment_terms.addItems([
-            "30 days", "60 days", "90 days", "120 days", "180 days", "Other"
-        ])
+        self.payment_terms.addItems(PAYMENT_TERMS_OPTIONS)
         
         trade_layout.addRow("Trade Type:", self.trade_type)
         trade_layout.addRow("Finance Amount:", self.finance_amount)
@@ -673,7 +912,7 @@ class TradeFinanceApplicationWindow(QWidget):
         financial_layout = QFormLayout()
         
         self.credit_history = QComboBox()
-        self.credit_history.addItems(["Excellent", "Good", "Fair", "Poor", "Unknown"])
+        self.credit_history.addItems(CREDIT_HISTORY_OPTIONS)
         self.existing_facilities = QDoubleSpinBox()
         self.existing_facilities.setRange(0, 999999999)
         self.existing_facilities.setSuffix(" USD")
@@ -721,37 +960,27 @@ class TradeFinanceApplicationWindow(QWidget):
     def submit_application(self):
         """Submit the trade finance application"""
         try:
+            fields = {key: read(getattr(self, key)) for key, read, _ in self._FIELDS}
+            
             # Validate required fields
-            if not self.company_name.text().strip():
+            if not fields['company_name']:
                 QMessageBox.warning(self, "Validation Error", "Company name is required.")
                 return
             
-            if not self.counterparty_name.text().strip():
+            if not fields['counterparty_name']:
                 QMessageBox.warning(self, "Validation Error", "Counterparty name is required.")
                 return
             
-            if self.finance_amount.value() <= 0:
+            if fields['finance_amount'] <= 0:
                 QMessageBox.warning(self, "Validation Error", "Finance amount must be greater than 0.")
                 return
             
             # Create application data
+            now = datetime.now()
             application_data = {
-                'application_id': f"TF{datetime.now().strftime('%Y%m%d')}{random.randint(1000, 9999)}",
-                'company_name': self.company_name.text().strip(),
-                'industry': self.industry.currentText(),
-                'annual_revenue': self.annual_revenue.value(),
-                'years_in_business': self.years_in_business.value(),
-                'trade_type': self.trade_type.currentText(),
-                'finance_amount': self.finance_amount.value(),
-                'counterparty_name': self.counterparty_name.text().strip(),
-                'counterparty_country': self.counterparty_country.currentText(),
-                'payment_terms': self.payment_terms.currentText(),
-                'credit_history': self.credit_history.currentText(),
-                'existing_facilities': self.existing_facilities.value(),
-                'collateral_offered': self.collateral_offered.text().strip(),
-                'purpose': self.purpose.toPlainText().strip(),
-                'special_requirements': self.special_requirements.toPlainText().strip(),
-                'submission_timestamp': datetime.now().isoformat(),
+                'application_id': f"TF{now.strftime('%Y%m%d')}{random.randint(1000, 9999)}",
+                **fields,
+                'submission_timestamp': now.isoformat(),
                 'status': 'submitted'
             }
             
@@ -773,34 +1002,215 @@ class TradeFinanceApplicationWindow(QWidget):
     
     def clear_form(self):
         """Clear all form fields"""
-        self.company_name.clear()
-        self.industry.setCurrentIndex(0)
-        self.annual_revenue.setValue(0)
-        self.years_in_business.setValue(0)
-        self.trade_type.setCurrentIndex(0)
-        self.finance_amount.setValue(0)
-        self.counterparty_name.clear()
-        self.counterparty_country.setCurrentIndex(0)
-        self.payment_terms.setCurrentIndex(0)
-        self.credit_history.setCurrentIndex(0)
-        self.existing_facilities.setValue(0)
-        self.collateral_offered.clear()
-        self.purpose.clear()
-        self.special_requirements.clear()
+        for key, _, reset in self._FIELDS:
+            reset(getattr(self, key))
+
+class QuerySignals(QObject):
+    """Signals emitted by QueryWorker"""
+    
+    finished = pyqtSignal(object)  # query result
+    failed = pyqtSignal(str)  # error message
+
+class QueryWorker(QRunnable):
+    """Thread pool task running one database query off the GUI thread"""
+    
+    def __init__(self, query, *args, **kwargs):
+        super().__init__()
+        self.signals = QuerySignals()
+        self.query = query
+        self.args = args
+        self.kwargs = kwargs
+    
+    def run(self):
+        """Run the query and emit its result"""
+        try:
+            result = self.query(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+# Officer table cell backgrounds, shared by every row
+_GREEN = QBrush(QColor(200, 255, 200))
+_RED = QBrush(QColor(255, 200, 200))
+_YELLOW = QBrush(QColor(255, 255, 200))
+_DARK_RED = QBrush(QColor(255, 150, 150))
+_STATUS_BRUSH = {'approved': _GREEN, 'rejected': _RED, 'processing': _YELLOW}
+_RISK_BRUSH = {'low': _GREEN, 'high': _RED, 'very_high': _DARK_RED}
+
+def format_application_details(application) -> str:
+    """Details panel text for a stored TradeFinanceApplication"""
+    parts = [f"""
+Application ID: {application.application_id}
+Company: {application.company_name}
+Registration: {application.company_registration or 'N/A'}
+Contact: {application.contact_person or 'N/A'}
+
+Trade Information:
+Type: {application.trade_type}
+Amount: {application.amount_display}
+Counterparty: {application.counterparty_name}
+Country: {application.counterparty_country}
+Payment Terms: {application.payment_terms}
+
+Status: {application.status}
+Risk Level: {application.risk_level}
+Submitted: {application.submitted_display or 'N/A'}
+Processed: {application.processed_display or 'N/A'}
+
+Trade Description: {application.trade_description or 'N/A'}
+Notes: {application.notes or 'N/A'}
+"""]
+    
+    # Add processing results if available
+    if application.processing_results:
+        try:
+            results = application.processing_results_obj
+            parts.append("\n\nProcessing Results:\n")
+            
+            if 'final_decision' in results:
+                decision = results['final_decision']
+                parts.append(f"Decision: {decision.get('decision', 'N/A')}\n")
+                parts.append(f"Final Score: {decision.get('final_score', 'N/A')}\n")
+                
+                if 'conditions' in decision:
+                    parts.append("Conditions:\n")
+                    parts.extend(f"  - {condition}\n" for condition in decision['conditions'])
+            
+            if 'credit_assessment' in results:
+                credit = results['credit_assessment']
+                parts.append(f"\nCredit Score: {credit.get('credit_score', 'N/A')}\n")
+                parts.append(f"Credit Rating: {credit.get('credit_rating', 'N/A')}\n")
+            
+        except json.JSONDecodeError:
+            parts.append("\nProcessing results available but could not be parsed.")
+    
+    return "".join(parts)
+
+class ApplicationsTableModel(QAbstractTableModel):
+    """Table model over the applications shown on the officer dashboard"""
+    
+    HEADERS = ("Application ID", "Company", "Trade Type", "Amount", "Status", "Risk Level", "Submitted")
+    STATUS_COLUMN = 4
+    RISK_COLUMN = 5
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._apps = []
+        self._rows = []
+        self._signatures = []
+    
+    def set_applications(self, applications):
+        """Replace the displayed applications, repainting only the rows that changed"""
+        signatures = [self._signature(app) for app in applications]
+        
+        if len(signatures) == len(self._signatures) and all(
+            new[0] == old[0] for new, old in zip(signatures, self._signatures)
+        ):
+            # Same applications in the same order: update changed rows in place
+            self._apps = list(applications)
+            last_column = len(self.HEADERS) - 1
+            for row, (new, old) in enumerate(zip(signatures, self._signatures)):
+                if new != old:
+                    self._rows[row] = self._display_row(applications[row])
+                    self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+            self._signatures = signatures
+            return
+        
+        self.beginResetModel()
+        self._apps = list(applications)
+        self._rows = [self._display_row(app) for app in applications]
+        self._signatures = signatures
+        self.endResetModel()
+    
+    def append_applications(self, applications):
+        """Add the next page of applications below the current rows"""
+        if not applications:
+            return
+        
+        first = len(self._apps)
+        self.beginInsertRows(QModelIndex(), first, first + len(applications) - 1)
+        self._apps.extend(applications)
+        self._rows.extend(self._display_row(app) for app in applications)
+        self._signatures.extend(self._signature(app) for app in applications)
+        self.endInsertRows()
+    
+    def application(self, row: int):
+        """The application shown in a row"""
+        return self._apps[row]
+    
+    @staticmethod
+    def _signature(app) -> Tuple[Any, ...]:
+        """The fields a refresh can change, led by the application id"""
+        return (app.application_id, app.status, app.risk_level, app.processed_at, app.finance_amount)
+    
+    @staticmethod
+    def _display_row(app) -> Tuple[str, ...]:
+        """Display strings for one application, computed once per refresh"""
+        return (
+            app.application_id or "",
+            app.company_name or "",
+            app.trade_type or "",
+            app.amount_display,
+            app.status or "",
+            app.risk_level or "",
+            app.submitted_display
+        )
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        
+        if role == Qt.ItemDataRole.UserRole:
+            return self._apps[index.row()]
+        
+        if role == Qt.ItemDataRole.BackgroundRole:
+            app = self._apps[index.row()]
+            if index.column() == self.STATUS_COLUMN:
+                return _STATUS_BRUSH.get(app.status)
+            if index.column() == self.RISK_COLUMN:
+                return _RISK_BRUSH.get(app.risk_level)
+        
+        return None
 
 class TradeFinanceOfficerWindow(QWidget):
     """Window for trade finance officers to review applications"""
     
+    # Fewest applications fetched per page, whatever the table height
+    MIN_PAGE_SIZE = 20
+    
     def __init__(self, db: Database):
         super().__init__()
         self.db = db
+        self._has_more = False
+        
+        # Application queries run one at a time on the global thread pool
+        self._query_worker = None
+        self._refresh_pending = False
+        
+        # Set when a refresh was skipped because the dashboard was hidden
+        self._stale = False
+        
+        # Set while a loaded page is written to the model; scroll bar and filter
+        # signals fired meanwhile must not start another query
+        self._refreshing = False
+        
         self.init_ui()
         self.refresh_applications()
-        
-        # Auto-refresh timer
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_applications)
-        self.refresh_timer.start(10000)  # Refresh every 10 seconds
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -832,26 +1242,43 @@ class TradeFinanceOfficerWindow(QWidget):
         
         layout.addLayout(filter_layout)
         
-        # Applications table
-        self.applications_table = QTableWidget()
-        self.applications_table.setColumnCount(8)
-        self.applications_table.setHorizontalHeaderLabels([
-            "Application ID", "Company", "Trade Type", "Amount", "Status", "Risk Level", "Submitted", "Actions"
-        ])
+        # Applications table; activate a row (double-click or Enter) or select it and
+        # use View Details, from the button or the context menu, to show it
+        self.applications_model = ApplicationsTableModel(self)
+        self.applications_table = QTableView()
+        self.applications_table.setModel(self.applications_model)
+        self.applications_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.applications_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.applications_table.activated.connect(self.show_row_details)
+        self.applications_table.verticalScrollBar().valueChanged.connect(self._load_more_if_near_bottom)
         
-        # Set column widths
+        # Set column widths; preset rather than ResizeToContents, which re-measures
+        # every cell whenever rows change
         header = self.applications_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(7, QHeaderView.ResizeMode.ResizeToContents)
+        for column, width in ((0, 150), (2, 160), (3, 130), (4, 130), (5, 100), (6, 150)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+            header.resizeSection(column, width)
         
         layout.addWidget(self.applications_table)
         
+        # One View Details action for the selected row, shared by the button and the context menu
+        self.view_details_action = QAction("View Details", self)
+        self.view_details_action.setEnabled(False)
+        self.view_details_action.triggered.connect(self.show_selected_application)
+        self.applications_table.addAction(self.view_details_action)
+        self.applications_table.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
+        
+        actions_layout = QHBoxLayout()
+        actions_layout.addStretch()
+        self.view_details_btn = QToolButton()
+        self.view_details_btn.setDefaultAction(self.view_details_action)
+        actions_layout.addWidget(self.view_details_btn)
+        layout.addLayout(actions_layout)
+        
+        self.applications_table.selectionModel().selectionChanged.connect(self._update_actions)
+        self.applications_model.modelReset.connect(self._update_actions)
+        
         # Details panel
         self.details_text = QTextEdit()
         self.details_text.setMaximumHeight(200)
@@ -861,119 +1288,133 @@ class TradeFinanceOfficerWindow(QWidget):
         
         self.setLayout(layout)
     
+    def _selected_status(self) -> Optional[str]:
+        """Status chosen in the filter, None for all"""
+        status_filter = self.status_filter.currentText()
+        return None if status_filter == "All" else status_filter
+    
+    def _page_size(self) -> int:
+        """Rows needed to fill the visible table area, plus one so it can scroll"""
+        row_height = max(self.applications_table.verticalHeader().defaultSectionSize(), 1)
+        visible_rows = self.applications_table.viewport().height() // row_height + 1
+        return max(visible_rows, self.MIN_PAGE_SIZE)
+    
+    def showEvent(self, event):
+        """Catch up on refreshes skipped while the dashboard was hidden"""
+        super().showEvent(event)
+        if self._stale:
+            self.refresh_applications()
+    
     def refresh_applications(self):
-        """Refresh the applications table"""
+        """Reload the applications table in the background"""
+        if self._refreshing:
+            self._refresh_pending = True
+            return
+        
+        if not self.isVisible():
+            self._stale = True
+            return
+        self._stale = False
+        
+        if self._query_worker is not None:
+            self._refresh_pending = True
+            return
+        
         try:
-            # Get filter
-            status_filter = self.status_filter.currentText()
-            if status_filter == "All":
-                status_filter = None
-            
-            # Get applications
-            applications = self.db.get_applications(limit=100, status=status_filter)
-            
-            # Update table
-            self.applications_table.setRowCount(len(applications))
-            
-            for row, app in enumerate(applications):
-                # Application ID
-                self.applications_table.setItem(row, 0, QTableWidgetItem(app.application_id or ""))
-                
-                # Company
-                self.applications_table.setItem(row, 1, QTableWidgetItem(app.company_name or ""))
-                
-                # Trade Type
-                self.applications_table.setItem(row, 2, QTableWidgetItem(app.trade_type or ""))
-                
-                # Amount
-                amount_str = f"${app.finance_amount:,.2f}" if app.finance_amount else "$0.00"
-                self.applications_table.setItem(row, 3, QTableWidgetItem(amount_str))
-                
-                # Status
-                status_item = QTableWidgetItem(app.status or "")
-                if app.status == 'approved':
-                    status_item.setBackground(QColor(200, 255, 200))
-                elif app.status == 'rejected':
-                    status_item.setBackground(QColor(255, 200, 200))
-                elif app.status == 'processing':
-                    status_item.setBackground(QColor(255, 255, 200))
-                self.applications_table.setItem(row, 4, status_item)
-                
-                # Risk Level
-                risk_item = QTableWidgetItem(app.risk_level or "")
-                if app.risk_level == 'low':
-                    risk_item.setBackground(QColor(200, 255, 200))
-                elif app.risk_level == 'high':
-                    risk_item.setBackground(QColor(255, 200, 200))
-                elif app.risk_level == 'very_high':
-                    risk_item.setBackground(QColor(255, 150, 150))
-                self.applications_table.setItem(row, 5, risk_item)
-                
-                # Submitted
-                submitted_str = app.submitted_at.strftime('%Y-%m-%d %H:%M') if app.submitted_at else ""
-                self.applications_table.setItem(row, 6, QTableWidgetItem(submitted_str))
-                
-                # Actions
-                actions_btn = QPushButton("View Details")
-                actions_btn.clicked.connect(lambda checked, a=app: self.show_application_details(a))
-                self.applications_table.setCellWidget(row, 7, actions_btn)
-            
-            logger.info(f"Refreshed {len(applications)} applications")
+            # Get the first page, or as many rows as have already been scrolled into view
+            limit = max(self._page_size(), self.applications_model.rowCount())
+            self._start_query(
+                lambda applications: self._applications_loaded(applications, limit),
+                status=self._selected_status(), limit=limit
+            )
             
         except Exception as e:
             logger.error(f"Error refreshing applications: {str(e)}")
     
+    def _load_more_if_near_bottom(self, value: int):
+        """Fetch the next page of applications once the table is scrolled to its end"""
+        if (not self._has_more or self._query_worker is not None or self._refreshing
+                or value < self.applications_table.verticalScrollBar().maximum()):
+            return
+        
+        try:
+            model = self.applications_model
+            page_size = self._page_size()
+            last_id = model.application(model.rowCount() - 1).application_id
+            self._start_query(
+                lambda applications: self._more_applications_loaded(applications, page_size),
+                status=self._selected_status(), limit=page_size, after_id=last_id
+            )
+            
+        except Exception as e:
+            logger.error(f"Error loading more applications: {str(e)}")
+    
+    def _start_query(self, on_finished, **kwargs):
+        """Run db.get_applications(**kwargs) on the thread pool, passing the result to on_finished"""
+        worker = QueryWorker(self.db.get_applications, **kwargs)
+        worker.signals.finished.connect(on_finished)
+        worker.signals.failed.connect(self._query_failed)
+        self._query_worker = worker
+        QThreadPool.globalInstance().start(worker)
+    
+    def _applications_loaded(self, applications, limit: int):
+        """Show a reloaded first page of applications"""
+        self._query_worker = None
+        self._has_more = len(applications) == limit
+        
+        # Update table, repainting once at the end
+        self._refreshing = True
+        self.applications_table.setUpdatesEnabled(False)
+        try:
+            self.applications_model.set_applications(applications)
+        finally:
+            self.applications_table.setUpdatesEnabled(True)
+            self._refreshing = False
+        
+        logger.info(f"Refreshed {len(applications)} applications")
+        self._run_pending_refresh()
+    
+    def _more_applications_loaded(self, applications, page_size: int):
+        """Append the next page of applications"""
+        self._query_worker = None
+        self._has_more = len(applications) == page_size
+        
+        self._refreshing = True
+        try:
+            self.applications_model.append_applications(applications)
+        finally:
+            self._refreshing = False
+        self._run_pending_refresh()
+    
+    def _query_failed(self, error: str):
+        self._query_worker = None
+        logger.error(f"Error loading applications: {error}")
+        self._run_pending_refresh()
+    
+    def _run_pending_refresh(self):
+        """Start a refresh that was requested while a query was running"""
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self.refresh_applications()
+    
+    def _update_actions(self):
+        """Enable View Details only while a row is selected"""
+        self.view_details_action.setEnabled(self.applications_table.selectionModel().hasSelection())
+    
+    def show_row_details(self, index: QModelIndex):
+        """Show details of an activated row"""
+        self.show_application_details(index.data(Qt.ItemDataRole.UserRole))
+    
+    def show_selected_application(self):
+        """Show details of the selected row"""
+        selected = self.applications_table.selectionModel().selectedRows()
+        if selected:
+            self.show_application_details(selected[0].data(Qt.ItemDataRole.UserRole))
+    
     def show_application_details(self, application):
         """Show detailed information about an application"""
         try:
-            details = f"""
-Application ID: {application.application_id}
-Company: {application.company_name}
-Industry: {application.industry}
-Annual Revenue: ${application.annual_revenue:,.2f}
-Years in Business: {application.years_in_business}
-
-Trade Information:
-Type: {application.trade_type}
-Amount: ${application.finance_amount:,.2f}
-Counterparty: {application.counterparty_name}
-Country: {application.counterparty_country}
-Payment Terms: {application.payment_terms}
-
-Status: {application.status}
-Risk Level: {application.risk_level}
-Submitted: {application.submitted_at.strftime('%Y-%m-%d %H:%M:%S') if application.submitted_at else 'N/A'}
-Processed: {application.processed_at.strftime('%Y-%m-%d %H:%M:%S') if application.processed_at else 'N/A'}
-
-Purpose: {application.purpose}
-Special Requirements: {application.special_requirements}
-"""
-            
-            # Add processing results if available
-            if application.processing_results:
-                try:
-                    results = json.loads(application.processing_results)
-                    details += "\n\nProcessing Results:\n"
-                    
-                    if 'final_decision' in results:
-                        decision = results['final_decision']
-                        details += f"Decision: {decision.get('decision', 'N/A')}\n"
-                        details += f"Final Score: {decision.get('final_score', 'N/A')}\n"
-                        
-                        if 'conditions' in decision:
-                            details += "Conditions:\n"
-                            for condition in decision['conditions']:
-                                details += f"  - {condition}\n"
-                    
-                    if 'credit_assessment' in results:
-                        credit = results['credit_assessment']
-                        details += f"\nCredit Score: {credit.get('credit_score', 'N/A')}\n"
-                        details += f"Credit Rating: {credit.get('credit_rating', 'N/A')}\n"
-                    
-                except json.JSONDecodeError:
-                    details += "\nProcessing results available but could not be parsed."
-            
-            self.details_text.setPlainText(details)
+            self.details_text.setPlainText(format_application_details(application))
             
         except Exception as e:
             logger.error(f"Error showing application details: {str(e)}")
@@ -982,6 +1423,9 @@ Special Requirements: {application.special_requirements}
 class TradeFinanceSystem(QMainWindow):
     """Main trade finance system application"""
     
+    # Emitted after any commit that changes applications, from the committing thread
+    data_changed = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         
@@ -989,16 +1433,39 @@ class TradeFinanceSystem(QMainWindow):
         self.db = Database()
         self.doc_processor = DocumentProcessor()
         
-        # Processing threads
-        self.processing_threads = {}
+        # Processing tasks, queued on a pool sized to the Ollama server's parallelism;
+        # the pool owns each task, and all of them report through one signals object
+        self.pending_applications = PendingApplications()
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(_ollama_num_parallel())
+        self.processing_signals = ProcessingSignals()
+        self.processing_signals.progress_updated.connect(self.update_processing_progress)
+        self.processing_signals.processing_completed.connect(self.handle_processing_completed)
+        
+        # Batched writer for processing results
+        self.db_writer = DatabaseWriterThread(self.db)
+        self.db_writer.results_written.connect(self.handle_results_written)
+        self.db_writer.results_failed.connect(self.handle_results_failed)
+        self.db_writer.start()
+        
+        # Processing status messages, written to the status bar at most every 50 ms
+        self._pending_status: Optional[str] = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setInterval(50)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.timeout.connect(self._flush_status)
+        
+        # Statistics query running on the global thread pool, and whether applications
+        # changed while it ran; a burst of changes costs at most one follow-up query
+        self._stats_worker = None
+        self._stats_invalidated = False
         
         self.init_ui()
         self.load_statistics()
         
-        # Auto-refresh timer
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_data)
-        self.refresh_timer.start(15000)  # Refresh every 15 seconds
+        # Refresh when the database reports changed applications instead of polling
+        self.data_changed.connect(self.handle_data_changed)
+        self.db.add_change_listener(self.data_changed.emit)
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -1074,78 +1541,147 @@ class TradeFinanceSystem(QMainWindow):
     
     def handle_new_application(self, application_data: Dict[str, Any]):
         """Handle new application submission"""
+        self.handle_new_applications([application_data])
+    
+    def handle_new_applications(self, applications_data: List[Dict[str, Any]]):
+        """Save several submitted applications at once, then start processing each"""
         try:
-            # Add to database
-            success = self.db.add_application(application_data)
+            # Add to database in one transaction
+            added = self.db.add_applications(applications_data)
+            saved = [data for data, success in zip(applications_data, added) if success]
             
-            if success:
-                # Start processing thread
-                application_id = application_data['application_id']
-                
-                processing_thread = TradeFinanceProcessingThread(
-                    application_data, self.db, self.doc_processor
-                )
-                processing_thread.progress_updated.connect(self.update_processing_progress)
-                processing_thread.processing_completed.connect(self.handle_processing_completed)
-                
-                self.processing_threads[application_id] = processing_thread
-                processing_thread.start()
-                
-                self.statusBar().showMessage(f"Processing application {application_id}...")
-                logger.info(f"Started processing application {application_id}")
+            if saved:
+                self.start_processing(saved)
                 
-                # Refresh data
-                self.refresh_data()
-            else:
+                if len(saved) == 1:
+                    self.show_status(f"Processing application {saved[0]['application_id']}...")
+                else:
+                    self.show_status(f"Processing {len(saved)} applications...")
+            
+            failed = len(applications_data) - len(saved)
+            if failed == 1:
                 QMessageBox.critical(self, "Database Error", "Failed to save application to database.")
+            elif failed:
+                QMessageBox.critical(self, "Database Error", f"Failed to save {failed} applications to database.")
                 
         except Exception as e:
             logger.error(f"Error handling new application: {str(e)}")
             QMessageBox.critical(self, "Application Error", f"Error processing application: {str(e)}")
     
+    def start_processing(self, applications_data: List[Dict[str, Any]]):
+        """Queue saved applications on the processing pool, split into one batch per pool thread"""
+        indices = [self.pending_applications.append(application_data) for application_data in applications_data]
+        
+        batch_count = min(len(indices), self.thread_pool.maxThreadCount())
+        for batch_number in range(batch_count):
+            batch_indices = indices[batch_number * len(indices) // batch_count:
+                                    (batch_number + 1) * len(indices) // batch_count]
+            processing_task = TradeFinanceRunnable(
+                self.pending_applications, batch_indices, self.db, self.doc_processor, self.db_writer,
+                self.processing_signals
+            )
+            self.thread_pool.start(processing_task)
+        
+        for application_data in applications_data:
+            logger.info(f"Started processing application {application_data['application_id']}")
+    
     def update_processing_progress(self, application_id: str, status: str, progress: int):
         """Update processing progress"""
-        self.statusBar().showMessage(f"Application {application_id}: {status} ({progress}%)")
+        self.show_status(f"Application {application_id}: {status} ({progress}%)")
+    
+    def show_status(self, message: str):
+        """Queue a status bar message; only the latest one per 50 ms is painted"""
+        self._pending_status = message
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+    
+    def _flush_status(self):
+        if self._pending_status is not None:
+            self.statusBar().showMessage(self._pending_status)
+            self._pending_status = None
     
     def handle_processing_completed(self, application_id: str, results: Dict[str, Any]):
         """Handle completed processing"""
         try:
             if 'error' in results:
-                self.statusBar().showMessage(f"Application {application_id}: Processing failed")
+                self.show_status(f"Application {application_id}: Processing failed")
                 logger.error(f"Processing failed for {application_id}: {results.get('error')}")
             else:
                 decision = results.get('final_decision', {}).get('decision', 'unknown')
-                self.statusBar().showMessage(f"Application {application_id}: {decision.title()}")
+                self.show_status(f"Application {application_id}: {decision.title()}")
                 logger.info(f"Processing completed for {application_id}: {decision}")
             
-            # Clean up thread
-            if application_id in self.processing_threads:
-                del self.processing_threads[application_id]
-            
-            # Refresh data
-            self.refresh_data()
-            
         except Exception as e:
             logger.error(f"Error handling processing completion: {str(e)}")
     
+    def handle_results_written(self, application_ids: List[str]):
+        """Log processing results committed by the database writer"""
+        logger.info(f"Processing results saved for {len(application_ids)} applications")
+    
+    def handle_results_failed(self, application_ids: List[str]):
+        """Report processing results the database writer could not save"""
+        if len(application_ids) == 1:
+            self.show_status(f"Application {application_ids[0]}: Failed to save processing results")
+        else:
+            self.show_status(f"Failed to save processing results for {len(application_ids)} applications")
+    
+    def handle_data_changed(self):
+        """Reload statistics and applications after the database changed"""
+        self.invalidate_statistics()
+        self.refresh_data()
+    
+    def closeEvent(self, event):
+        """Finish running applications and queries, and flush pending database writes before closing"""
+        self.thread_pool.waitForDone()
+        QThreadPool.globalInstance().waitForDone()
+        self.db_writer.stop()
+        super().closeEvent(event)
+    
     def load_statistics(self):
-        """Load and display statistics"""
+        """Load and display statistics, querying in the background"""
         try:
-            stats = self.db.get_trade_finance_statistics()
-            
-            for key, label in self.stats_labels.items():
-                value = stats.get(key, 0)
-                if key == 'approval_rate':
-                    label.setText(f"{value}%")
-                else:
-                    label.setText(str(value))
+            if self._stats_worker is not None:
+                return
             
-            logger.info("Statistics loaded successfully")
+            worker = QueryWorker(self.db.get_trade_finance_statistics)
+            worker.signals.finished.connect(self._statistics_loaded)
+            worker.signals.failed.connect(self._statistics_failed)
+            self._stats_worker = worker
+            QThreadPool.globalInstance().start(worker)
             
         except Exception as e:
-            logger.error(f"Error loading statistics: {str(e)}")
-            for label in self.stats_labels.values():
-                label.setText("Error")
+            self._statistics_failed(str(e))
+    
+    def _statistics_loaded(self, stats: Dict[str, Any]):
+        self._stats_worker = None
+        self.show_statistics(stats)
+        
+        if self._stats_invalidated:
+            # Applications changed while the query ran, so the result may be stale
+            self._stats_invalidated = False
+            self.load_statistics()
+    
+    def _statistics_failed(self, error: str):
+        self._stats_worker = None
+        logger.error(f"Error loading statistics: {error}")
+        for label in self.stats_labels.values():
+            label.setText("Error")
+    
+    def show_statistics(self, stats: Dict[str, Any]):
+        """Display statistics"""
+        for key, label in self.stats_labels.items():
+            value = stats.get(key, 0)
+            if key == 'approval_rate':
+                label.setText(f"{value}%")
+            else:
+                label.setText(str(value))
+        
+        logger.info("Statistics loaded successfully")
+    
+    def invalidate_statistics(self):
+        """Mark a running statistics query as stale after the applications change"""
+        if self._stats_worker is not None:
+            self._stats_invalidated = True
     
     def refresh_data(self):
         """Refresh all data"""